@@ -0,0 +1,53 @@
+"""
+Shared helpers for the benchmark scripts.
+
+These drive :class:`.State` directly with fake gateway payloads, so no connection to Discord is
+needed. Run a script against two commits to compare them.
+"""
+import time
+
+import multio
+
+from curious.core import current_bot
+from curious.core.client import Client
+
+multio.init("trio")
+
+
+class FakeGateway(object):
+    """
+    Stands in for a shard's gateway in event parsers.
+    """
+
+    class gw_state:
+        shard_id = 0
+
+
+def make_client() -> Client:
+    """
+    Makes a client that is never connected, and sets it as the current bot.
+    """
+    client = Client("benchmark")
+    current_bot.set(client)
+    return client
+
+
+async def drain(gen):
+    """
+    Runs an event parser to completion, discarding the events it yields.
+    """
+    async for _ in gen:
+        pass
+
+
+class Timer(object):
+    """
+    Times the body of a ``with`` block.
+    """
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *args):
+        self.elapsed = time.perf_counter() - self.start
@@ -0,0 +1,76 @@
+"""
+MESSAGE_CREATE throughput with 20,000 guilds of 5 channels each.
+
+Every MESSAGE_CREATE looks up its channel with :meth:`.State.find_channel`. This compares the
+channel ID index against the old scan over every guild's channels.
+"""
+from _common import FakeGateway, Timer, drain, make_client
+
+import multio
+
+from curious.core.state import State
+
+GUILDS = 20_000
+CHANNELS = 5
+MESSAGES = 200
+
+
+def scan_find_channel(self: State, channel_id: int):
+    """
+    The old :meth:`.State.find_channel`, which checked every guild.
+    """
+    if channel_id in self._guilds:
+        return self._guilds[channel_id].channels.get(channel_id)
+
+    if channel_id in self._private_channels:
+        return self._private_channels[channel_id]
+
+    for guild in self._guilds.values():
+        if channel_id in guild._channels:
+            return guild._channels[channel_id]
+
+    return None
+
+
+def guild(guild_id: int) -> dict:
+    return {
+        "id": str(guild_id * 1000), "name": "guild", "owner_id": "1", "roles": [], "members": [],
+        "channels": [
+            {"id": str(guild_id * 1000 + i), "name": "channel", "type": 0, "position": i}
+            for i in range(1, CHANNELS + 1)
+        ],
+    }
+
+
+def message(i: int) -> dict:
+    channel_id = (i * 7919 % GUILDS + 1) * 1000 + 3
+    return {
+        "id": str(10 ** 12 + i), "channel_id": str(channel_id), "content": "hello",
+        "author": {"id": "5", "username": "user", "discriminator": "0001"},
+    }
+
+
+async def main():
+    client = make_client()
+    state = client.state
+
+    for guild_id in range(1, GUILDS + 1):
+        await drain(state.handle_guild_create(FakeGateway, guild(guild_id)))
+
+    messages = [message(i) for i in range(MESSAGES)]
+    indexed = State.find_channel
+
+    for label, find_channel in (("scan", scan_find_channel), ("index", indexed)):
+        State.find_channel = find_channel
+        state.messages.clear()
+        with Timer() as timer:
+            for data in messages:
+                await drain(state.handle_message_create(FakeGateway, data))
+
+        print(f"{label}: {MESSAGES / timer.elapsed:,.0f} MESSAGE_CREATE/s")
+
+    State.find_channel = indexed
+
+
+if __name__ == "__main__":
+    multio.run(main)
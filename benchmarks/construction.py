@@ -0,0 +1,39 @@
+"""
+Dataclass construction rate.
+
+This creates 20,000 new users through :meth:`.State.make_user`, so every one goes through the
+guard in :meth:`.Dataclass.__new__` that stops user code from making dataclasses. It then checks
+that the guard still refuses a dataclass made from here.
+"""
+from _common import Timer, make_client
+
+from curious.dataclasses.role import Role
+
+USERS = 20_000
+
+
+def main():
+    client = make_client()
+    state = client.state
+
+    payloads = [
+        {"id": str(10 ** 17 + i), "username": "user", "discriminator": "0001"}
+        for i in range(USERS)
+    ]
+
+    with Timer() as timer:
+        for data in payloads:
+            state.make_user(data)
+
+    print(f"User via State.make_user: {USERS / timer.elapsed:,.0f} objects/s")
+
+    try:
+        Role(id=1)
+    except RuntimeError:
+        print("guard: refused Role(id=1) from user code")
+    else:
+        print("guard: allowed Role(id=1) from user code")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Memory used by the members of one large guild.
+
+This plays a GUILD_CREATE with 100,000 members (10% of them online) and reports the memory still
+held once the payload is gone, measured with :mod:`tracemalloc`. It then touches every member's
+``joined_at``, ``nickname`` and ``roles`` and reports again. Pass another member count as the first
+argument to change the size.
+"""
+import gc
+import sys
+import tracemalloc
+
+from _common import FakeGateway, Timer, drain, make_client
+
+import multio
+
+MEMBERS = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+
+
+def member(i: int) -> dict:
+    return {
+        "user": {
+            "id": str(10 ** 17 + i), "username": f"user{i}", "discriminator": f"{i % 10_000:04d}",
+            "avatar": "a" * 32,
+        },
+        "roles": [str(10 ** 17 + 1 + i % 7), str(10 ** 17 + 2)] if i % 3 else [],
+        "nick": f"nick{i}" if i % 5 == 0 else None,
+        "joined_at": "2017-06-01T12:34:56.123456+00:00", "deaf": False, "mute": False,
+    }
+
+
+def mib(size: int) -> str:
+    return f"{size / 2 ** 20:.1f} MiB ({size / MEMBERS:.0f} B/member)"
+
+
+async def main():
+    client = make_client()
+    state = client.state
+
+    data = {
+        "id": "1", "name": "guild", "large": True, "member_count": MEMBERS, "channels": [],
+        "roles": [], "members": [member(i) for i in range(MEMBERS)],
+        "presences": [
+            {"user": {"id": str(10 ** 17 + i)}, "status": "online", "game": None}
+            for i in range(0, MEMBERS, 10)
+        ],
+    }
+
+    gc.collect()
+    tracemalloc.start()
+    with Timer() as timer:
+        await drain(state.handle_guild_create(FakeGateway, data))
+
+    del data
+    gc.collect()
+    retained, _ = tracemalloc.get_traced_memory()
+    print(f"GUILD_CREATE with {MEMBERS:,} members: {timer.elapsed:.2f}s")
+    print(f"retained, including users: {mib(retained)}")
+
+    for member_ in state._guilds[1].members.values():
+        member_.joined_at, member_.nickname, member_.roles
+
+    gc.collect()
+    touched, _ = tracemalloc.get_traced_memory()
+    print(f"after touching every member: {mib(touched)}")
+
+
+if __name__ == "__main__":
+    multio.run(main)
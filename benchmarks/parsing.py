@@ -0,0 +1,76 @@
+"""
+GUILD_CREATE and MESSAGE_CREATE parse throughput.
+
+This plays 200 GUILD_CREATEs, each with 200 members, 30 channels and 20 roles, and then 50,000
+MESSAGE_CREATEs in those guilds.
+"""
+from _common import FakeGateway, Timer, drain, make_client
+
+import multio
+
+GUILDS = 200
+MEMBERS = 200
+CHANNELS = 30
+ROLES = 20
+MESSAGES = 50_000
+
+
+def guild(guild_id: int) -> dict:
+    base = guild_id * 1000
+    return {
+        "id": str(guild_id), "name": "guild", "owner_id": "1",
+        "channels": [
+            {"id": str(base + i), "name": "channel", "type": 0, "position": i, "topic": "topic",
+             "last_message_id": "5"}
+            for i in range(CHANNELS)
+        ],
+        "roles": [
+            {"id": str(base + 500 + i), "name": "role", "permissions": 104324161, "position": i,
+             "color": 0}
+            for i in range(ROLES)
+        ],
+        "members": [
+            {"user": {"id": str(10 ** 9 + base + i), "username": "user", "discriminator": "0001",
+                      "avatar": None},
+             "roles": [str(base + 500 + i % ROLES)], "nick": None,
+             "joined_at": "2018-01-01T00:00:00.123+00:00"}
+            for i in range(MEMBERS)
+        ],
+    }
+
+
+def message(i: int) -> dict:
+    return {
+        "id": str(10 ** 12 + i), "channel_id": str(1000 + i % CHANNELS), "type": 0,
+        "author": {"id": str(10 ** 9 + 1000 + i % MEMBERS), "username": "user",
+                   "discriminator": "0001"},
+        "content": "hello world", "timestamp": "2018-01-01T00:00:00.123000+00:00",
+        "edited_timestamp": None, "embeds": [], "attachments": [], "mentions": [],
+        "mention_roles": [], "member": {"roles": [], "joined_at": "2018-01-01T00:00:00+00:00"},
+    }
+
+
+async def main():
+    client = make_client()
+    state = client.state
+    await drain(state.handle_ready(FakeGateway, {
+        "user": {"id": "1", "username": "benchmark", "discriminator": "0001"}, "guilds": [],
+    }))
+
+    guilds = [guild(i) for i in range(1, GUILDS + 1)]
+    with Timer() as timer:
+        for data in guilds:
+            await drain(state.handle_guild_create(FakeGateway, data))
+
+    print(f"GUILD_CREATE: {GUILDS / timer.elapsed:,.0f} guilds/s")
+
+    messages = [message(i) for i in range(MESSAGES)]
+    with Timer() as timer:
+        for data in messages:
+            await drain(state.handle_message_create(FakeGateway, data))
+
+    print(f"MESSAGE_CREATE: {MESSAGES / timer.elapsed:,.0f} messages/s")
+
+
+if __name__ == "__main__":
+    multio.run(main)
@@ -0,0 +1,73 @@
+"""
+Startup time for one shard with 2,500 guilds.
+
+This plays a READY with every guild unavailable, then a GUILD_CREATE for each guild (half of them
+large) and a member chunk for each large guild, passing each one to the chunker as the client
+would. The chunker's readiness checks run after every guild and every chunk.
+"""
+from _common import FakeGateway, Timer, drain, make_client
+
+import multio
+
+GUILDS = 2_500
+
+
+class ChunkingGateway(FakeGateway):
+    """
+    A gateway that ignores member chunk requests.
+    """
+
+    async def send_guild_chunks(self, guild_ids):
+        pass
+
+
+def guild(guild_id: int) -> dict:
+    large = guild_id % 2 == 0
+    return {
+        "id": str(guild_id), "name": "guild", "large": large,
+        "member_count": 5_000 if large else 10, "channels": [], "roles": [], "members": [],
+    }
+
+
+async def main():
+    client = make_client()
+    state, chunker = client.state, client.chunker
+    client._gateways[0] = ChunkingGateway()
+
+    fired = []
+
+    async def fire_event(name, **kwargs):
+        fired.append(name)
+
+    client.events.fire_event = fire_event
+
+    ready = {
+        "user": {"id": "1", "username": "benchmark", "discriminator": "0001"},
+        "guilds": [{"id": str(i), "unavailable": True} for i in range(1, GUILDS + 1)],
+    }
+    guilds = [guild(i) for i in range(1, GUILDS + 1)]
+
+    with Timer() as timer:
+        await drain(state.handle_ready(ChunkingGateway, ready))
+        chunker._connected[0] = True
+
+        for data in guilds:
+            await drain(state.handle_guild_create(ChunkingGateway, data))
+            created = state._guilds[int(data["id"])]
+            await chunker.potentially_add_to_pending(created)
+            await chunker.handle_member_chunk(created, 0)
+
+        for data in guilds:
+            if not data["large"]:
+                continue
+
+            chunk = {"guild_id": data["id"], "members": []}
+            await drain(state.handle_guild_members_chunk(ChunkingGateway, chunk))
+            await chunker.handle_member_chunk(state._guilds[int(data["id"])], 0)
+
+    print(f"startup with {GUILDS:,} guilds: {timer.elapsed:.2f}s")
+    print(f"events fired: {', '.join(fired)}")
+
+
+if __name__ == "__main__":
+    multio.run(main)
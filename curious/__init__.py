@@ -47,7 +47,7 @@ del _fmt
 from curious.core.client import BotType, Client
 from curious.core.event import EventContext, event
 from curious.core.gateway import open_websocket, GatewayHandler
-from curious.core.state import GuildStore, State
+from curious.core.state import CachePolicy, GuildStore, MessageStore, State
 from curious.dataclasses.appinfo import AppInfo
 from curious.dataclasses.attachment import Attachment
 from curious.dataclasses.bases import Dataclass, IDObject
@@ -55,7 +55,8 @@ from curious.dataclasses.channel import Channel, ChannelType
 from curious.dataclasses.embed import Embed
 from curious.dataclasses.emoji import Emoji
 from curious.dataclasses.guild import ContentFilterLevel, Guild, GuildChannelWrapper, \
-    GuildEmojiWrapper, GuildRoleWrapper, MFALevel, NotificationLevel, VerificationLevel
+    GuildEmojiWrapper, GuildRoleWrapper, MFALevel, MemberStore, NotificationLevel, \
+    VerificationLevel
 from curious.dataclasses.invite import Invite, InviteChannel, InviteGuild, InviteMetadata
 from curious.dataclasses.member import Member
 from curious.dataclasses.message import Message
@@ -65,7 +66,7 @@ from curious.dataclasses.role import Role
 from curious.dataclasses.search import SearchQuery, SearchResults
 from curious.dataclasses.user import User
 from curious.dataclasses.voice_state import VoiceState
-from curious.dataclasses.webhook import Webhook
+from curious.dataclasses.webhook import Webhook, WebhookSender
 from curious.dataclasses.widget import Widget, WidgetChannel, WidgetGuild, WidgetMember
 
 # for asks
@@ -72,7 +72,7 @@ def convert_channel(ann, ctx, arg: str) -> Channel:
     if channel_id is not None:
         channel = ctx.guild.channels.get(channel_id)
     else:
-        channel = next(filter(lambda c: c.name == arg, ctx.guild.channels.values()), None)
+        channel = ctx.guild.channels.get(arg)
 
     if channel is None:
         raise ConversionFailedError(ctx, arg, Channel, "Could not find channel")
@@ -96,7 +96,7 @@ def convert_role(ann, ctx, arg: str) -> Role:
     if role_id is not None:
         role = ctx.guild.roles.get(role_id)
     else:
-        role = next(filter(lambda c: c.name == arg, ctx.guild.roles.values()), None)
+        role = ctx.guild.roles.get(arg)
 
     if role is None:
         raise ConversionFailedError(ctx, arg, Role, "Could not find role")
@@ -85,7 +85,7 @@ class Chunker(object):
 
             if len(guilds) < self.batch_size:
                 # if all are available, skip the exit check
-                if any(guild.unavailable for guild in self.client.guilds_for(shard)):
+                if self.client.state.count_unavailable(shard):
                     continue
 
             # pray for the gil
@@ -104,14 +104,14 @@ class Chunker(object):
         if self._ready[shard_id]:
             return
 
-        guilds = self.client.guilds_for(shard_id)
+        state = self.client.state
 
         # if they're unavailable we clearly don't have the members
-        if any(guild.unavailable is True for guild in guilds):
+        if state.count_unavailable(shard_id):
             return
 
         # if they're not all set then we don't want to fire ready at all
-        if not all(guild._finished_chunking.is_set() for guild in guilds if guild.large):
+        if state.count_unchunked(shard_id):
             return
 
         # fire a ready
@@ -132,6 +132,10 @@ class Chunker(object):
         """
         Potentially adds a guild to the pending count.
         """
+        # no point in chunking if we won't cache the members
+        if not self.client.state.cache_policy.members:
+            return
+
         if guild.large:
             logger.debug("Added guild `%s` to chunk pending", guild.id)
             self._pending[guild.shard_id].append(guild)
@@ -144,6 +148,9 @@ class Chunker(object):
         """
         Handles a new guild (just become available for) has just joined.
         """
+        if not self.client.state.cache_policy.members:
+            return
+
         # immediately chunk
         await self.fire_chunks(guild.shard_id, [guild])
 
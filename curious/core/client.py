@@ -43,7 +43,7 @@ from curious.dataclasses.presence import Game, Status
 from curious.dataclasses.user import BotUser, User
 from curious.dataclasses.webhook import Webhook
 from curious.dataclasses.widget import Widget
-from curious.util import base64ify
+from curious.util import _PrefetchTask, base64ify
 
 logger = logging.getLogger("curious.client")
 
@@ -103,11 +103,13 @@ class Client(object):
 
     def __init__(self, token: str, *,
                  state_klass: type = None,
-                 bot_type: int = (BotType.BOT | BotType.ONLY_USER)):
+                 bot_type: int = (BotType.BOT | BotType.ONLY_USER),
+                 cache_policy: 'CachePolicy' = None):
         """
         :param token: The current token for this bot.
         :param state_klass: The class to construct the connection state from.
         :param bot_type: A union of :class:`.BotType` that defines the type of this bot.
+        :param cache_policy: The :class:`.CachePolicy` that controls what the state caches.
         """
         #: The mapping of `shard_id -> gateway` objects.
         self._gateways = {}  # type: typing.MutableMapping[int, GatewayHandler]
@@ -123,7 +125,7 @@ class Client(object):
             state_klass = State
 
         #: The current connection state for the bot.
-        self.state = state_klass(self)
+        self.state = state_klass(self, cache_policy=cache_policy)
 
         #: The bot type for this bot.
         self.bot_type = bot_type
@@ -486,6 +488,97 @@ class Client(object):
 
         return member
 
+    async def _fetch_member_page(self, guild_id: int, limit: int, after: int,
+                                 promise: 'multio.Promise'):
+        """
+        Fetches a single page of members into a promise, for prefetching.
+
+        Errors are stored in the promise rather than raised, so that they propagate to the
+        iterator waiting on it and not to the client task group.
+        """
+        try:
+            data = await self.http.get_guild_members(guild_id=guild_id, limit=limit, after=after)
+        except Exception as e:
+            data = e
+
+        await promise.set(data)
+
+    async def iter_guild_members(self, guild_id: int, *,
+                                 after: int = None, limit: int = 1000,
+                                 prefetch: bool = False) \
+            -> 'typing.AsyncGenerator[typing.List[dt_member.Member], None]':
+        """
+        Downloads the members for a :class:`.Guild` over HTTP, yielding a batch of
+        :class:`.Member` for every page as it arrives.
+
+        .. code-block:: python3
+
+            async for batch in bot.iter_guild_members(guild.id, prefetch=True):
+                for member in batch:
+                    ...
+
+        Only a single page of raw member data is held at any one time.
+
+        :param guild_id: The ID of the guild to download members for.
+        :param after: The member ID after which to start fetching members.
+        :param limit: The number of members to fetch per page (at most 1000).
+        :param prefetch: If True, the next page will be requested whilst the current batch is \
+            being processed by the caller.
+        """
+        last_id = after or 0
+        pending = None  # type: multio.Promise
+        prefetcher = None  # type: _PrefetchTask
+
+        try:
+            while True:
+                if pending is not None:
+                    next_data = await pending.wait()
+                    pending = None
+                    if isinstance(next_data, Exception):
+                        raise next_data
+                else:
+                    next_data = await self.http.get_guild_members(guild_id=guild_id, limit=limit,
+                                                                  after=last_id)
+
+                # no more members to get
+                if not next_data:
+                    return
+
+                # if there's less data than limit, this is the last page
+                finished = len(next_data) < limit
+                last_id = next_data[-1]["user"]["id"]
+
+                # we can only prefetch inside a running client
+                if not finished and prefetch and self.task_manager is not None:
+                    pending = multio.Promise()
+                    prefetcher = _PrefetchTask()
+                    await multio.asynclib.spawn(self.task_manager, prefetcher.run,
+                                                self._fetch_member_page,
+                                                guild_id, limit, last_id, pending)
+
+                batch = []
+                for datum in next_data:
+                    m = dt_member.Member._decode(datum)
+                    m.guild_id = guild_id
+                    batch.append(m)
+
+                # drop the raw page before handing off the batch
+                del next_data
+                try:
+                    yield batch
+                finally:
+                    # these members aren't cached, so don't keep their users around unless
+                    # something else (e.g. download_guild) took a reference to them
+                    for m in batch:
+                        self.state._check_decache_user(m.id)
+
+                if finished:
+                    return
+        finally:
+            # the caller stopped early, so don't leave the next page downloading
+            if prefetcher is not None:
+                await prefetcher.cancel()
+
     async def download_guild_members(self, guild_id: int, *,
                                      after: int = None, limit: int = 1000,
                                      get_all: bool = True) -> 'typing.Iterable[dt_member.Member]':
@@ -495,6 +588,10 @@ class Client(object):
         .. warning::
         
             This can take a long time on big guilds.
+
+        .. seealso::
+
+            :meth:`.Client.iter_guild_members` to process members page-by-page instead.
         
         :param guild_id: The ID of the guild to download members for.
         :param after: The member ID after which to get members for.
@@ -502,33 +599,23 @@ class Client(object):
         :param get_all: Should *all* members be fetched?
         :return: An iterable of :class:`.Member`.
         """
-        member_data = []
-        if get_all is True:
-            last_id = 0
-            while True:
-                next_data = await self.http.get_guild_members(guild_id=guild_id, limit=limit,
-                                                              after=last_id)
-                # no more members to get
-                if not next_data:
-                    break
+        if get_all is not True:
+            member_data = await self.http.get_guild_members(guild_id=guild_id, limit=limit,
+                                                            after=after)
+            members = []
+            for datum in member_data:
+                m = dt_member.Member._decode(datum)
+                m.guild_id = guild_id
+                members.append(m)
+                self.state._check_decache_user(m.id)
 
-                member_data.extend(next_data)
-                # if there's less data than limit, we are finished downloading members
-                if len(next_data) < limit:
-                    break
+            return members
 
-                last_id = member_data[-1]["user"]["id"]
-        else:
-            next_data = await self.http.get_guild_members(guild_id=guild_id, limit=limit,
-                                                          after=after)
-            member_data.extend(next_data)
-
-        # create the member objects
         members = []
-        for datum in member_data:
-            m = dt_member.Member(**datum)
-            m.guild_id = guild_id
-            members.append(m)
+        async with multio.asynclib.finalize_agen(
+                self.iter_guild_members(guild_id, limit=limit)) as agen:
+            async for batch in agen:
+                members.extend(batch)
 
         return members
 
@@ -542,7 +629,7 @@ class Client(object):
         channel_data = await self.http.get_guild_channels(guild_id=guild_id)
         channels = []
         for datum in channel_data:
-            channel = dt_channel.Channel(**datum)
+            channel = dt_channel.Channel._decode(datum)
             channel.guild_id = guild_id
             channels.append(channel)
 
@@ -568,17 +655,38 @@ class Client(object):
         guild.unavailable = False
 
         # update the guild store
+        old_guild = self.state._guilds.get(guild_id)
+        if old_guild is not None:
+            self.state._uncache_guild(old_guild, keep_messages=True)
+            guild.shard_id = old_guild.shard_id
+        elif self.shard_count:
+            guild.shard_id = (guild_id >> 22) % self.shard_count
+        else:
+            guild.shard_id = 0
+
         self.state._guilds[guild_id] = guild
+        self.state._update_guild_status(guild)
 
         if full:
-            # download all of the members
-            members = await self.download_guild_members(guild_id=guild_id, get_all=True)
-            # update the `_members` dict
-            guild._members = {m.id: m for m in members}
+            # download all of the members, filling the guild as each page arrives
+            async with multio.asynclib.finalize_agen(
+                    self.iter_guild_members(guild_id, prefetch=True)) as agen:
+                async for batch in agen:
+                    for member in batch:
+                        if not self.state._should_cache_member(member.id):
+                            continue
+
+                        guild._members[member.id] = member
+                        self.state._track_member(guild_id, member.id)
 
             # download all of the channels
+            # NB: update in place, as the channel wrapper holds a reference to the dict
             channels = await self.download_channels(guild_id=guild_id)
-            guild._channels = {c.id: c for c in channels}
+            guild._channels.update((c.id, c) for c in channels)
+            self.state._index_guild_channels(guild)
+
+            # cached messages are kept on reload, so drop the ones in channels that are now gone
+            self.state._drop_stale_messages(guild)
 
         return guild
 
@@ -621,6 +729,13 @@ class Client(object):
             await self.kill()
             raise
 
+    @ev_dec(name="gateway_heartbeat_ack")
+    async def handle_heartbeat_ack(self):
+        """
+        Expires cached messages, so that they expire even when no other events arrive.
+        """
+        self.state.messages.expire()
+
     @ev_dec(name="ready")
     async def handle_ready(self):
         """
@@ -146,6 +146,19 @@ class EventManager(object):
         """
         self.event_hooks.remove(listener)
 
+    def has_listeners(self, event_name: str) -> bool:
+        """
+        Checks if anything will receive an event.
+
+        This lets the state skip building event arguments (such as copies of objects before an
+        update) that nothing would see.
+
+        :param event_name: The name of the event.
+        :return: True if there are any event hooks, or any listeners for this event.
+        """
+        return bool(self.event_hooks) or event_name in self.event_listeners \
+            or event_name in self.temporary_listeners
+
     # wrapper functions
     async def _safety_wrapper(self, func, *args, **kwargs):
         """
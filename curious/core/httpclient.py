@@ -272,6 +272,23 @@ class HTTPClient(object):
             self._rate_limits[bucket] = lock
             return lock
 
+    def get_ratelimit_remaining(self, bucket: object) -> typing.Union[int, None]:
+        """
+        Gets the number of requests left in a ratelimit bucket before it will have to sleep.
+
+        :param bucket: The full bucket to check, e.g. ``("GET", "messages:1234")``.
+        :return: The number of requests remaining, or None if the bucket is unknown or has reset.
+        """
+        try:
+            tries, reset_time = self._ratelimit_remaining[bucket]
+        except KeyError:
+            return None
+
+        if reset_time <= time.time():
+            return None
+
+        return tries
+
     # Special wrapper functions
     @staticmethod
     def get_response_data(response: Response) -> typing.Union[str, dict]:
@@ -1676,7 +1693,8 @@ class HTTPClient(object):
 
         # URL params, not payload
         params = {"wait": str(wait)}
-        data = await self.post(url, bucket="webhooks", json=payload, params=params)
+        data = await self.post(url, bucket="webhooks:{}".format(webhook_id), json=payload,
+                               params=params)
 
         return data
 
@@ -19,8 +19,8 @@ Defines :class:`.State`.
 .. currentmodule:: curious.core.state
 """
 
-import copy
 import logging
+import time
 import typing
 from types import MappingProxyType
 
@@ -28,12 +28,11 @@ import collections
 import multio
 
 from curious.core import gateway
-from curious.dataclasses.bases import allow_external_makes
 from curious.dataclasses.channel import Channel, ChannelType
 from curious.dataclasses.emoji import Emoji
 from curious.dataclasses.guild import ContentFilterLevel, Guild, MFALevel, NotificationLevel, \
     VerificationLevel
-from curious.dataclasses.member import Member
+from curious.dataclasses.member import Member, _make_presence
 from curious.dataclasses.message import Message
 from curious.dataclasses.permissions import Permissions
 from curious.dataclasses.reaction import Reaction
@@ -105,6 +104,264 @@ class GuildStore(collections.MutableMapping):
         return self.guilds.__len__()
 
 
+class MessageStore(object):
+    """
+    A bounded, ordered store for cached messages, keyed by message ID.
+
+    This behaves like a ``deque(maxlen=...)`` of messages, with the oldest message being
+    evicted when a new one is added to a full store, but lookups, replacements and removals by
+    ID are all O(1). Every limit is a number of messages, not a size in bytes.
+
+    Messages are also partitioned by channel and by guild, each of which can be given its own
+    cap so that one busy channel cannot evict the history of every other channel. Messages can
+    optionally expire after a number of seconds.
+
+    The caps and TTL are normally set with a :class:`.CachePolicy`:
+
+    .. code-block:: python3
+
+        policy = CachePolicy(max_messages=100_000, max_messages_per_channel=1000,
+                             message_ttl=3600)
+        client = Client(token, cache_policy=policy)
+    """
+
+    def __init__(self, max_messages: int = 500, *,
+                 max_per_channel: int = None, max_per_guild: int = None, ttl: float = None):
+        """
+        :param max_messages: The maximum number of messages to store overall.
+        :param max_per_channel: The maximum number of messages to store per channel.
+        :param max_per_guild: The maximum number of messages to store per guild.
+        :param ttl: The number of seconds a message is kept for after being stored.
+        """
+        #: The maximum number of messages to store.
+        self.max_messages = max_messages
+
+        #: The maximum number of messages to store for a single channel.
+        self.max_per_channel = max_per_channel
+
+        #: The maximum number of messages to store for a single guild.
+        self.max_per_guild = max_per_guild
+
+        #: The number of seconds a message is kept for, or None to keep them until evicted.
+        self.ttl = ttl
+
+        self._messages = collections.OrderedDict()  # type: typing.Dict[int, Message]
+        self._channels = {}  # type: typing.Dict[int, typing.Dict[int, Message]]
+        self._guilds = {}  # type: typing.Dict[int, typing.Dict[int, Message]]
+        self._expires = {}  # type: typing.Dict[int, float]
+
+    def _discard(self, message_id: int) -> None:
+        """
+        Removes a message from the store and its partitions, if it is stored.
+        """
+        message = self._messages.pop(message_id, None)
+        if message is None:
+            return
+
+        self._expires.pop(message_id, None)
+
+        for partitions, key in ((self._channels, message.channel_id),
+                                (self._guilds, message.guild_id)):
+            partition = partitions.get(key)
+            if partition is None:
+                continue
+
+            partition.pop(message_id, None)
+            if not partition:
+                del partitions[key]
+
+    def expire(self) -> None:
+        """
+        Removes any messages that have outlived the TTL.
+
+        This is called when the store is used, and by the :class:`.Client` on every gateway
+        heartbeat, so that messages still expire when no events arrive.
+        """
+        if self.ttl is None:
+            return
+
+        # messages are stored oldest first, so this stops at the first unexpired message
+        now = time.monotonic()
+        while self._messages:
+            oldest = next(iter(self._messages))
+            if self._expires[oldest] > now:
+                break
+
+            self._discard(oldest)
+
+    def get(self, message_id: int) -> 'typing.Union[Message, None]':
+        """
+        :param message_id: The ID of the message to get.
+        :return: The :class:`.Message` with this ID, or None if it is not stored.
+        """
+        self.expire()
+        return self._messages.get(message_id)
+
+    def append(self, message: Message) -> None:
+        """
+        Adds a message to the store, evicting the oldest messages if the store or the message's
+        channel or guild is full.
+
+        If a message with the same ID is already stored, it is replaced and becomes the newest
+        message.
+
+        :param message: The :class:`.Message` to add.
+        """
+        self._discard(message.id)
+        self._messages[message.id] = message
+        if self.ttl is not None:
+            self._expires[message.id] = time.monotonic() + self.ttl
+
+        for partitions, key, cap in ((self._channels, message.channel_id, self.max_per_channel),
+                                     (self._guilds, message.guild_id, self.max_per_guild)):
+            if key is None:
+                continue
+
+            partition = partitions.get(key)
+            if partition is None:
+                partition = partitions[key] = collections.OrderedDict()
+
+            partition[message.id] = message
+            if cap is not None:
+                while len(partition) > cap:
+                    self._discard(next(iter(partition)))
+
+        while len(self._messages) > self.max_messages:
+            self._discard(next(iter(self._messages)))
+
+        self.expire()
+
+    def remove(self, message: Message) -> None:
+        """
+        Removes a message from the store.
+
+        :param message: The :class:`.Message` to remove.
+        """
+        if message.id not in self._messages:
+            raise KeyError(message.id)
+
+        self._discard(message.id)
+
+    def remove_channel(self, channel_id: int) -> None:
+        """
+        Removes every message in a channel from the store.
+
+        :param channel_id: The ID of the channel to remove messages for.
+        """
+        for message_id in list(self._channels.get(channel_id, ())):
+            self._discard(message_id)
+
+    def for_channel(self, channel_id: int) -> 'typing.List[Message]':
+        """
+        :param channel_id: The ID of the channel to get messages for.
+        :return: A list of the stored :class:`.Message` objects in this channel, oldest first.
+        """
+        self.expire()
+        return list(self._channels.get(channel_id, {}).values())
+
+    def for_guild(self, guild_id: int) -> 'typing.List[Message]':
+        """
+        :param guild_id: The ID of the guild to get messages for.
+        :return: A list of the stored :class:`.Message` objects in this guild, oldest first.
+        """
+        self.expire()
+        return list(self._guilds.get(guild_id, {}).values())
+
+    def clear(self) -> None:
+        """
+        Removes every message from the store.
+        """
+        self._messages.clear()
+        self._channels.clear()
+        self._guilds.clear()
+        self._expires.clear()
+
+    def __contains__(self, message: Message) -> bool:
+        self.expire()
+        return message.id in self._messages
+
+    def __iter__(self) -> 'typing.Iterator[Message]':
+        self.expire()
+        return iter(self._messages.values())
+
+    def __reversed__(self) -> 'typing.Iterator[Message]':
+        self.expire()
+        return reversed(self._messages.values())
+
+    def __len__(self) -> int:
+        self.expire()
+        return len(self._messages)
+
+
+class CachePolicy(object):
+    """
+    Controls what the :class:`.State` keeps in its cache.
+
+    Anything that is not cached is still parsed and dispatched in events where possible, but
+    lookups for it will fail, e.g. :attr:`.Message.author` is a :class:`.User` instead of a
+    :class:`.Member` if the member isn't cached.
+
+    .. code-block:: python3
+
+        # only cache members that have been seen in the last 10 minutes, and no presences
+        policy = CachePolicy(member_ttl=600, presences=False)
+        client = Client(token, cache_policy=policy)
+    """
+
+    def __init__(self, *,
+                 members: bool = True, member_ttl: float = None,
+                 presences: bool = True, voice_states: bool = True, emojis: bool = True,
+                 messages: bool = True, max_messages: int = 500,
+                 max_messages_per_channel: int = None, max_messages_per_guild: int = None,
+                 message_ttl: float = None):
+        """
+        :param members: If members should be cached. If this is False, only the bot's own \
+            member is cached, and guilds are not chunked.
+        :param member_ttl: The number of seconds since a member was last seen before it is \
+            removed from the cache, or None to keep members until they leave.
+        :param presences: If member presences should be cached.
+        :param voice_states: If member voice states should be cached.
+        :param emojis: If guild emojis should be cached.
+        :param messages: If messages should be cached.
+        :param max_messages: The maximum number of messages to cache.
+        :param max_messages_per_channel: The maximum number of messages to cache per channel, or \
+            None for no limit.
+        :param max_messages_per_guild: The maximum number of messages to cache per guild, or \
+            None for no limit.
+        :param message_ttl: The number of seconds a message is cached for, or None to keep \
+            messages until they are evicted.
+        """
+        #: If members should be cached.
+        self.members = members
+
+        #: The number of seconds a member is kept for after it was last seen.
+        self.member_ttl = member_ttl
+
+        #: If member presences should be cached.
+        self.presences = presences
+
+        #: If member voice states should be cached.
+        self.voice_states = voice_states
+
+        #: If guild emojis should be cached.
+        self.emojis = emojis
+
+        #: If messages should be cached.
+        self.messages = messages
+
+        #: The maximum number of messages to cache.
+        self.max_messages = max_messages
+
+        #: The maximum number of messages to cache per channel.
+        self.max_messages_per_channel = max_messages_per_channel
+
+        #: The maximum number of messages to cache per guild.
+        self.max_messages_per_guild = max_messages_per_guild
+
+        #: The number of seconds a message is cached for.
+        self.message_ttl = message_ttl
+
+
 class State(object):
     """
     This represents the state of the Client - in other libraries, the cache.
@@ -112,7 +369,19 @@ class State(object):
     The other main purpose for this class is to parse events from the Discord websocket.
     """
 
-    def __init__(self, client, max_messages: int = 500):
+    def __init__(self, client, max_messages: int = 500, *,
+                 cache_policy: CachePolicy = None):
+        """
+        :param client: The :class:`.Client` this state is for.
+        :param max_messages: The maximum number of messages to cache, if no policy is passed.
+        :param cache_policy: The :class:`.CachePolicy` that controls what is cached.
+        """
+        if cache_policy is None:
+            cache_policy = CachePolicy(max_messages=max_messages)
+
+        #: The :class:`.CachePolicy` for this state.
+        self.cache_policy = cache_policy
+
         #: The current user of this bot.
         #: This is automatically set after login.
         self._user = None  # type: BotUser
@@ -123,15 +392,42 @@ class State(object):
         #: The private channel cache.
         self._private_channels = {}
 
+        #: The channel ID -> channel index, for both guild and private channels.
+        self._channels = {}
+
+        #: The emoji ID -> emoji index, for every guild.
+        self._emojis = {}
+
         #: The guilds the bot can see.
         self._guilds = GuildStore()
 
         #: The current user cache.
         self._users = {}
 
-        #: The deque of messages.
+        #: The number of guilds and private channels referencing each cached user.
+        self._user_refs = collections.Counter()
+
+        #: The user ID -> guild IDs index, for every guild the user is a member of.
+        self._user_guilds = {}  # type: typing.Dict[int, typing.Set[int]]
+
+        #: The (guild ID, member ID) -> time last seen, for expiring members.
+        self._member_seen = collections.OrderedDict()
+
+        #: The store of cached messages.
         #: This is bounded to prevent the message cache from growing infinitely.
-        self.messages = collections.deque(maxlen=max_messages)
+        self.messages = MessageStore(cache_policy.max_messages,
+                                     max_per_channel=cache_policy.max_messages_per_channel,
+                                     max_per_guild=cache_policy.max_messages_per_guild,
+                                     ttl=cache_policy.message_ttl)
+
+        #: The shard ID -> guild ID -> guild index.
+        self._shard_guilds = collections.defaultdict(dict)
+
+        #: The shard ID -> IDs of guilds that are unavailable.
+        self._shard_unavailable = collections.defaultdict(set)
+
+        #: The shard ID -> IDs of large guilds that have not finished chunking.
+        self._shard_unchunked = collections.defaultdict(set)
 
         self.__shards_is_ready = collections.defaultdict(lambda: False)
         self.__voice_state_crap = collections.defaultdict(
@@ -155,6 +451,40 @@ class State(object):
 
         for guild in self.guilds_for_shard(shard_id):
             guild._finished_chunking.clear()
+            self._update_guild_status(guild)
+
+    def _update_guild_status(self, guild: Guild):
+        """
+        Updates the shard index and the unavailable and unchunked sets for a guild.
+
+        This must be called whenever the shard, availability or chunking status of a cached guild
+        changes.
+
+        :param guild: The :class:`.Guild` to update.
+        """
+        shard_id = guild.shard_id
+        self._shard_guilds[shard_id][guild.id] = guild
+
+        if guild.unavailable is True:
+            self._shard_unavailable[shard_id].add(guild.id)
+        else:
+            self._shard_unavailable[shard_id].discard(guild.id)
+
+        if self.cache_policy.members and guild.large and not guild._finished_chunking.is_set():
+            self._shard_unchunked[shard_id].add(guild.id)
+        else:
+            self._shard_unchunked[shard_id].discard(guild.id)
+
+    def _remove_guild_status(self, guild: Guild):
+        """
+        Removes a guild from the shard index.
+
+        :param guild: The :class:`.Guild` to remove.
+        """
+        shard_id = guild.shard_id
+        self._shard_guilds[shard_id].pop(guild.id, None)
+        self._shard_unavailable[shard_id].discard(guild.id)
+        self._shard_unchunked[shard_id].discard(guild.id)
 
     @property
     def guilds(self) -> typing.Mapping[int, Guild]:
@@ -174,20 +504,33 @@ class State(object):
         """
         Checks if we have all the chunks for the specified shard.
 
+        .. versionchanged:: 1.0.0
+
+            This only checks guilds on the specified shard, and only large guilds need chunking.
+
         :param shard_id: The shard ID to check.
         """
-        if any(guild.unavailable is True for guild in self.guilds.values()):
-            return False
+        return not self._shard_unavailable[shard_id] and not self._shard_unchunked[shard_id]
 
-        return all(guild._finished_chunking.is_set()
-                   for guild in self.guilds.values()
-                   if guild.shard_id == shard_id and guild.unavailable is False)
+    def count_unavailable(self, shard_id: int) -> int:
+        """
+        :param shard_id: The shard ID to check.
+        :return: The number of guilds on the specified shard that are unavailable.
+        """
+        return len(self._shard_unavailable[shard_id])
+
+    def count_unchunked(self, shard_id: int) -> int:
+        """
+        :param shard_id: The shard ID to check.
+        :return: The number of large guilds on the specified shard that haven't finished chunking.
+        """
+        return len(self._shard_unchunked[shard_id])
 
     def guilds_for_shard(self, shard_id: int):
         """
         Gets all the guilds for a particular shard.
         """
-        return [guild for guild in self.guilds.values() if guild.shard_id == shard_id]
+        return list(self._shard_guilds[shard_id].values())
 
     # get_all_* methods
     def get_all_channels(self) -> typing.Generator[Channel, None, None]:
@@ -221,14 +564,24 @@ class State(object):
         :param user_id: The user ID to find.
         :return: The :class:`.Member` or :class:`.User` found, if any.
         """
-        for guild in self.guilds.values():
+        for guild_id in self._user_guilds.get(user_id, ()):
             try:
-                return guild.members[user_id]
+                return self._guilds[guild_id]._members[user_id]
             except KeyError:
                 continue
 
         return self._users.get(user_id)
 
+    def guilds_for_user(self, user_id: int) -> typing.List[Guild]:
+        """
+        Gets all the guilds a user is a member of.
+
+        :param user_id: The ID of the user to get guilds for.
+        :return: A list of the :class:`.Guild` objects the user is a member of.
+        """
+        return [self._guilds[guild_id] for guild_id in self._user_guilds.get(user_id, ())
+                if guild_id in self._guilds]
+
     def find_channel(self, channel_id: int) -> typing.Union[Channel, None]:
         """
         Finds a channel by ID.  
@@ -237,20 +590,7 @@ class State(object):
         :param channel_id: The ID of the channel to find.
         :return: A :class:`.Channel` that represents the channel, or None if no channel was found.
         """
-        # default channel_id == guild id
-        # for old guilds with a default channel
-        if channel_id in self._guilds:
-            try:
-                return self._guilds[channel_id].channels[channel_id]
-            except KeyError:
-                return None
-
-        if channel_id in self._private_channels:
-            return self._private_channels[channel_id]
-
-        for guild in self._guilds.values():
-            if channel_id in guild._channels:
-                return guild._channels[channel_id]
+        return self._channels.get(channel_id)
 
     def find_message(self, message_id: int) -> Message:
         """
@@ -259,36 +599,146 @@ class State(object):
         :param message_id: The message ID to find.
         :return: A :class:`.Message` to find, or None if it was not cached.
         """
-        for message in reversed(self.messages):
-            if message.id == message_id:
-                return message
+        return self.messages.get(message_id)
 
     def _check_decache_user(self, id: int):
         """
         Checks if we should decache a user.
 
-        This will check if there is any guild with a reference to the user.
+        This will check if there is any guild or private channel with a reference to the user.
         """
-        # don't check if its not there
-        if id not in self._users:
+        if self._user_refs[id] > 0:
             return
 
         # don't decache ourself
-        if self._users[id] == self._user:
+        if self._user is not None and id == self._user.id:
             return
 
-        # check if its in a private channel
-        for channel in self._private_channels.values():
-            if id in channel.recipients:
-                return
+        # no references
+        self._users.pop(id, None)
 
-        # check if it's any guilds
-        for guild in self._guilds.values():
-            if id in guild.members:
-                return
+    def _incref_user(self, id: int):
+        """
+        Adds a reference to a user, from a guild member or private channel recipient.
+        """
+        self._user_refs[id] += 1
 
-        # didn't return, so no references
-        self._users.pop(id, None)
+    def _decref_user(self, id: int):
+        """
+        Removes a reference to a user, decaching it if there are no references left.
+        """
+        self._user_refs[id] -= 1
+        if self._user_refs[id] <= 0:
+            del self._user_refs[id]
+            self._check_decache_user(id)
+
+    def _track_member(self, guild_id: int, user_id: int):
+        """
+        Records that a user is a member of a cached guild.
+        """
+        guild_ids = self._user_guilds.get(user_id)
+        if guild_ids is None:
+            guild_ids = self._user_guilds[user_id] = set()
+
+        if guild_id not in guild_ids:
+            guild_ids.add(guild_id)
+            self._incref_user(user_id)
+
+        self._touch_member(guild_id, user_id)
+
+    def _untrack_member(self, guild_id: int, user_id: int):
+        """
+        Records that a user is no longer a member of a cached guild.
+        """
+        guild_ids = self._user_guilds.get(user_id)
+        if guild_ids is None or guild_id not in guild_ids:
+            return
+
+        guild_ids.remove(guild_id)
+        if not guild_ids:
+            del self._user_guilds[user_id]
+
+        self._member_seen.pop((guild_id, user_id), None)
+        self._decref_user(user_id)
+
+    def _snapshot(self, event_name: str, obb):
+        """
+        Copies an object that is about to be updated, for the "before" half of an update event.
+
+        Copying is skipped when nothing is listening for the event; the object itself is used
+        instead, as nothing will see it. Otherwise, this is a full copy - the object is changed
+        straight after, so a copy-on-write snapshot would be copied every time anyway.
+        """
+        if self.client.events.has_listeners(event_name):
+            return obb._copy()
+
+        return obb
+
+    def _should_cache_member(self, user_id: int) -> bool:
+        """
+        Checks if a member should be cached, according to the cache policy.
+        """
+        return self.cache_policy.members or (self._user is not None and user_id == self._user.id)
+
+    def _touch_member(self, guild_id: int, user_id: int):
+        """
+        Marks a cached member as just seen, and expires members that haven't been seen recently.
+        """
+        ttl = self.cache_policy.member_ttl
+        if ttl is None:
+            return
+
+        key = (guild_id, user_id)
+        now = time.monotonic()
+        self._member_seen.pop(key, None)
+        self._member_seen[key] = now
+
+        # oldest first, so stop at the first member that was seen recently
+        while self._member_seen:
+            (guild_id, user_id), seen = next(iter(self._member_seen.items()))
+            if now - seen < ttl:
+                break
+
+            del self._member_seen[(guild_id, user_id)]
+            # never expire ourselves
+            if self._user is not None and user_id == self._user.id:
+                continue
+
+            guild = self._guilds.get(guild_id)
+            if guild is not None:
+                guild._members.pop(user_id, None)
+
+            self._untrack_member(guild_id, user_id)
+
+    def _uncache_guild(self, guild: Guild, *, keep_messages: bool = False):
+        """
+        Removes everything that references a guild that is no longer cached.
+
+        :param guild: The :class:`.Guild` to remove references to.
+        :param keep_messages: If the cached messages in the guild's channels should be kept, \
+            because the guild is being replaced with a new copy of itself.
+        """
+        for channel_id in guild._channels:
+            self._channels.pop(channel_id, None)
+            if not keep_messages:
+                self.messages.remove_channel(channel_id)
+
+        for emoji_id in guild._emojis:
+            self._emojis.pop(emoji_id, None)
+
+        for member_id in guild._members:
+            self._untrack_member(guild.id, member_id)
+
+    def _drop_stale_messages(self, guild: Guild):
+        """
+        Removes the cached messages in channels that a guild no longer has.
+
+        :param guild: The :class:`.Guild` whose channels were just replaced.
+        """
+        gone = {message.channel_id for message in self.messages.for_guild(guild.id)
+                if message.channel_id not in guild._channels}
+        for channel_id in gone:
+            self.messages.remove_channel(channel_id)
 
     # make_ methods
     def make_webhook(self, event_data: dict) -> Webhook:
@@ -343,11 +793,24 @@ class State(object):
         :param channel_data: The channel data to cache.
         :return: A new :class:`.Channel`.
         """
-        channel = Channel(**channel_data)
-        self._private_channels[channel.id] = channel
+        channel = Channel._decode(channel_data)
+        # the recipients of a channel that is already cached already hold a reference
+        if channel.id not in self._private_channels:
+            for user_id in channel._recipients:
+                self._incref_user(user_id)
 
+        self._private_channels[channel.id] = channel
+        self._channels[channel.id] = channel
         return channel
 
+    def _index_guild_channels(self, guild: Guild):
+        """
+        Adds all of the channels of a guild to the channel index.
+
+        :param guild: The :class:`.Guild` to index.
+        """
+        self._channels.update(guild._channels)
+
     def make_user(self, user_data: dict, *,
                   user_klass: typing.Type[UserType] = User,
                   override_cache: bool = False) -> UserType:
@@ -363,7 +826,7 @@ class State(object):
         if id in self._users and not override_cache:
             return self._users[id]
 
-        user = user_klass(**user_data)
+        user = user_klass._decode(user_data)
         self._users[user.id] = user
 
         return user
@@ -376,12 +839,12 @@ class State(object):
         :param cache: Should this message be cached?
         :return: A new :class:`.Message` object for the message.
         """
-        message = Message(**event_data)
+        message = Message._decode(event_data)
 
-        if message in self.messages:
+        cached_message = self.messages.get(message.id)
+        if cached_message is not None:
             # don't bother re-caching
-            i = self.messages.index(message)
-            return self.messages[i]
+            return cached_message
 
         # discord won't give us the Guild id
         # so we have to search it from the channels
@@ -405,22 +868,14 @@ class State(object):
                 message.author = self.make_webhook(event_data)
             else:
                 message.author = message.guild.members.get(author_id)
-
-        for reaction_data in event_data.get("reactions", []):
-            emoji = reaction_data.get("emoji", {})
-            reaction = Reaction(**reaction_data)
-
-            if "id" in emoji and emoji["id"] is not None:
-                emoji_obb = message.guild.emojis.get(int(emoji["id"]))
-                if emoji_obb is None:
-                    emoji_obb = Emoji(id=emoji["id"], name=emoji["name"])
-            else:
-                emoji_obb = emoji.get("name", None)
-
-            reaction.emoji = emoji_obb
-            message.reactions.append(reaction)
-
-        if cache and message not in self.messages:
+                if message.author is None and "author" in event_data:
+                    # the member isn't cached, so fall back to the user
+                    message.author = self.make_user(event_data["author"])
+                    self._check_decache_user(author_id)
+                else:
+                    self._touch_member(message.guild_id, author_id)
+
+        if cache and self.cache_policy.messages:
             self.messages.append(message)
 
         return message
@@ -459,10 +914,17 @@ class State(object):
 
         # Create all of the guilds.
         for guild in event_data.get("guilds", []):
+            old_guild = self._guilds.get(int(guild["id"]))
+            if old_guild is not None:
+                # a new session, so the guild is replaced; its messages go once its channels arrive
+                self._uncache_guild(old_guild, keep_messages=True)
+
             new_guild = Guild(**guild)
             self._guilds[new_guild.id] = new_guild
             new_guild.from_guild_create(**guild)
             new_guild.shard_id = gw.gw_state.shard_id
+            self._index_guild_channels(new_guild)
+            self._update_guild_status(new_guild)
 
         logger.info("Ready processed for shard {}. Delaying until all guilds are chunked."
                     .format(gw.gw_state.shard_id))
@@ -520,26 +982,35 @@ class State(object):
             member = Member(user=event_data["user"])
             old_member = None
         else:
-            old_member = member._copy()
+            old_member = self._snapshot("member_update", member)
 
         # Update the member's presence
-        member.presence.status = event_data.get("status")
-        member.presence.game = event_data.get("game", {})
+        # this is replaced rather than mutated, as offline members share one presence object
+        if self.cache_policy.presences:
+            member.presence = _make_presence(event_data.get("status") or member.status,
+                                             event_data.get("game", {}))
+            guild._members.update_status(member)
 
         # copy the roles if it exists
         roles = event_data.get("roles", [])
         if roles:
             # clear roles
-            member.role_ids = [int(rid) for rid in roles]
+            guild._members.set_roles(member, roles)
 
         # update the nickname
-        member.nickname = event_data.get("nick", member.nickname.value)
+        guild._members.set_nickname(member, event_data.get("nick", member.nickname.value))
         # recreate the user object, so the user is properly cached
         if "username" in event_data["user"]:
+            old_username = member.user.username
             self.make_user(event_data["user"], override_cache=True)
+            guild._members.rename_user(member, old_username)
 
         yield "member_update", old_member, member,
 
+        # members made from a presence aren't cached
+        if old_member is None:
+            self._check_decache_user(user_id)
+
     async def handle_presences_replace(self, gw: 'gateway.GatewayHandler', event_data):
         """
         Called when presences are replaced.
@@ -573,6 +1044,7 @@ class State(object):
         if guild._chunks_left <= 0:
             # Set the finished chunking event.
             await guild._finished_chunking.set()
+            self._update_guild_status(guild)
 
     async def handle_guild_create(self, gw: 'gateway.GatewayHandler', event_data: dict):
         """
@@ -583,6 +1055,13 @@ class State(object):
 
         had_guild = True
         if guild:
+            if not event_data.get("unavailable", False):
+                # this has every channel, so drop the ones deleted since the guild was cached
+                channel_ids = {int(channel["id"]) for channel in event_data.get("channels", [])}
+                for channel_id in guild._channels.keys() - channel_ids:
+                    del guild._channels[channel_id]
+                    self._channels.pop(channel_id, None)
+
             guild.from_guild_create(**event_data)
         else:
             had_guild = False
@@ -591,6 +1070,11 @@ class State(object):
             guild.from_guild_create(**event_data)
 
         guild.shard_id = gw.gw_state.shard_id
+        self._index_guild_channels(guild)
+        self._update_guild_status(guild)
+        if had_guild and not guild.unavailable:
+            self._drop_stale_messages(guild)
+
         # TODO: Need to do this
         # try:
         #    guild.me.presence.game = gw.game
@@ -608,6 +1092,7 @@ class State(object):
                 # Hence, we fire a `guild_join` event.
                 # Parse the guild.
                 guild.from_guild_create(**event_data)
+                self._index_guild_channels(guild)
                 yield "guild_join", guild,
 
                 logger.info("Joined guild {} ({}), requesting members if applicable"
@@ -632,9 +1117,7 @@ class State(object):
         if not guild:
             return
 
-        # disable dataclass checking temporarily
-        with allow_external_makes():
-            old_guild = copy.copy(guild)
+        old_guild = self._snapshot("guild_update", guild)
 
         guild.unavailable = event_data.get("unavailable", False)
         guild.name = event_data.get("name", guild.name)
@@ -663,6 +1146,8 @@ class State(object):
         guild.afk_channel_id = int_or_none(event_data.get("afk_channel"), guild.afk_channel_id)
         guild.afk_timeout = event_data.get("afk_timeout", guild.afk_timeout)
         guild.owner_id = int_or_none(event_data.get("owner_id"), guild.owner_id)
+        guild._role_version += 1
+        self._update_guild_status(guild)
 
         yield "guild_update", old_guild, guild,
 
@@ -679,16 +1164,16 @@ class State(object):
             guild = self._guilds.get(guild_id)
             if guild:
                 guild.unavailable = True
+                self._update_guild_status(guild)
                 yield "guild_unavailable", guild,
 
         else:
             # We've left this guild - clear it from our dictionary of guilds.
             guild = self._guilds.pop(guild_id, None)
             if guild:
+                self._uncache_guild(guild)
+                self._remove_guild_status(guild)
                 yield "guild_leave", guild,
-                for member in guild._members.values():
-                    # use member.id to avoid user lookup
-                    self._check_decache_user(member.id)
 
     async def handle_guild_emojis_update(self, gw: 'gateway.GatewayHandler', event_data: dict):
         """
@@ -697,10 +1182,10 @@ class State(object):
         guild_id = int(event_data.get("guild_id", 0))
         guild = self._guilds.get(guild_id)
 
-        if not guild:
+        if not guild or not self.cache_policy.emojis:
             return
 
-        old_guild = guild._copy()
+        old_guild = self._snapshot("guild_emojis_update", guild)
         emojis = event_data.get("emojis", [])
         guild._handle_emojis(emojis)
 
@@ -737,7 +1222,7 @@ class State(object):
         if not old_message:
             return
 
-        self.messages.remove(old_message)
+        # replacing moves it to the newest end, the same as removing and re-adding it
         self.messages.append(new_message)
 
         if old_message.content != new_message.content:
@@ -782,11 +1267,17 @@ class State(object):
             # str only
             return emoji_data["name"]
 
-        # try and get it from the guilds
-        for guild in self.guilds.values():
-            em = guild.emojis.get(int(emoji_data["id"]))
-            if em:
-                return em
+        return self._emojis.get(int(emoji_data["id"]))
+
+    def find_emoji(self, emoji_id: int) -> typing.Union[Emoji, None]:
+        """
+        Finds an emoji by ID.
+        This will search the emojis of all guilds.
+
+        :param emoji_id: The ID of the emoji to find.
+        :return: The :class:`.Emoji` with this ID, or None if no emoji was found.
+        """
+        return self._emojis.get(emoji_id)
 
     async def handle_message_reaction_add(self, gw: 'gateway.GatewayHandler', event_data: dict):
         """
@@ -802,19 +1293,12 @@ class State(object):
         if not message:
             return
 
-        # complex filter
-        def _f(r: Reaction):
-            if not r.emoji:
-                return False
-
-            e = self._find_emoji(event_data["emoji"])
-            if not e:
-                # ¯\_(ツ)_/¯
-                return False
-
-            return r.emoji == e
-
-        reaction = next(filter(_f, message.reactions), None)
+        e = self._find_emoji(event_data["emoji"])
+        if e:
+            reaction = next((r for r in message.reactions if r.emoji and r.emoji == e), None)
+        else:
+            # ¯\_(ツ)_/¯
+            reaction = None
 
         if not reaction:
             emoji = event_data.get("emoji", {})
@@ -822,7 +1306,7 @@ class State(object):
             reaction = Reaction()
 
             if "id" in emoji and emoji["id"] is not None:
-                emoji_obb = message.guild.emojis.get(int(emoji["id"]))
+                emoji_obb = self._emojis.get(int(emoji["id"]))
                 if emoji_obb is None:
                     emoji_obb = Emoji(id=emoji["id"], name=emoji["name"])
             else:
@@ -873,16 +1357,12 @@ class State(object):
         if not message:
             return
 
-        def _f(r: Reaction):
-            if not r.emoji:
-                return False
-
-            e = self._find_emoji(event_data["emoji"])
-            if not e:
-                # ¯\_(ツ)_/¯
-                return False
-
-        reaction = next(filter(_f, message.reactions), None)
+        e = self._find_emoji(event_data["emoji"])
+        if e:
+            reaction = next((r for r in message.reactions if r.emoji and r.emoji == e), None)
+        else:
+            # ¯\_(ツ)_/¯
+            reaction = None
         if not reaction:
             # nothing to do
             return
@@ -906,11 +1386,17 @@ class State(object):
         if not guild:
             return
 
-        member = Member(**event_data)
+        member = Member._decode(event_data)
         member.guild_id = guild.id
+        guild.member_count += 1
+
+        if not self._should_cache_member(member.id):
+            yield "guild_member_add", member,
+            self._check_decache_user(member.id)
+            return
 
+        self._track_member(guild.id, member.id)
         guild._members[member.id] = member
-        guild.member_count += 1
         yield "guild_member_add", member,
 
     async def handle_guild_member_remove(self, gw: 'gateway.GatewayHandler', event_data: dict):
@@ -929,6 +1415,8 @@ class State(object):
             # We can't see the member, so don't fire an event for it.
             return
 
+        self._untrack_member(guild.id, member.id)
+
         yield "guild_member_remove", member,
 
     async def handle_guild_member_update(self, gw: 'gateway.GatewayHandler', event_data: dict):
@@ -948,17 +1436,21 @@ class State(object):
             return
 
         # Make a copy of the member for the old previous reference.
-        old_member = member._copy()
-        # Re-create the user object.
-        # self.make_user(event_data["user"], override_cache=True)
-        # self._users[member.user.id] = member.user
+        old_member = self._snapshot("guild_member_update", member)
+        # Re-create the user object, keeping the username index up to date.
+        new_username = event_data["user"].get("username")
+        if new_username is not None and new_username != member.user.username:
+            old_username = member.user.username
+            self.make_user(event_data["user"], override_cache=True)
+            guild._members.rename_user(member, old_username)
 
         # Overwrite roles, we want to get rid of any roles that are stale.
         if "roles" in event_data:
-            member.role_ids = [int(i) for i in event_data.get("roles", [])]
+            guild._members.set_roles(member, event_data.get("roles", []))
 
         guild._members[member.id] = member
-        member.nickname = event_data.get("nick", member.nickname.value)
+        guild._members.set_nickname(member, event_data.get("nick", member.nickname.value))
+        self._touch_member(guild.id, member.id)
 
         yield "guild_member_update", old_member, member,
 
@@ -1003,17 +1495,23 @@ class State(object):
         guild_id = int(event_data.get("guild_id", 0))
         guild = self._guilds.get(guild_id)
 
-        channel = Channel(**event_data)
+        channel = Channel._decode(event_data)
         if channel.private:
+            if channel.id not in self._private_channels:
+                for user_id in channel._recipients:
+                    self._incref_user(user_id)
+
             self._private_channels[channel.id] = channel
         else:
             channel.guild_id = guild.id
             channel._update_overwrites((event_data.get("permission_overwrites", [])))
             if channel.id not in guild._channels:
                 guild._channels[channel.id] = channel
+                guild._channel_version += 1
             else:
                 channel = guild._channels[channel.id]
 
+        self._channels[channel.id] = channel
         yield "channel_create", channel,
 
     async def handle_channel_update(self, gw: 'gateway.GatewayHandler', event_data: dict):
@@ -1026,7 +1524,7 @@ class State(object):
         if not channel:
             return
 
-        old_channel = channel._copy()
+        old_channel = self._snapshot("channel_update", channel)
 
         channel.name = event_data.get("name", channel.name)
         channel.position = event_data.get("position", channel.position)
@@ -1037,22 +1535,31 @@ class State(object):
         channel.parent_id = int_or_none(event_data.get("parent_id"), channel.parent_id)
 
         channel._update_overwrites(event_data.get("permission_overwrites", []))
+        if channel.guild is not None:
+            channel.guild._channel_version += 1
+
         yield "channel_update", old_channel, channel,
 
     async def handle_channel_delete(self, gw: 'gateway.GatewayHandler', event_data: dict):
         """
         Called when a channel is deleted.
         """
-        channel_id = int(event_data.get("channel_id", 0))
-        channel = self.find_channel(channel_id)
+        channel_id = int(event_data.get("id", 0))
+        channel = self._channels.pop(channel_id, None)
 
         if not channel:
             return
 
+        self.messages.remove_channel(channel.id)
         if channel.private:
-            del self._private_channels[channel.id]
+            self._private_channels.pop(channel.id, None)
+            for user_id in channel._recipients:
+                self._decref_user(user_id)
         else:
-            del channel.guild._channels[channel.id]
+            guild = self._guilds.get(channel.guild_id)
+            if guild is not None:
+                guild._channels.pop(channel.id, None)
+                guild._channel_version += 1
 
         yield "channel_delete", channel,
 
@@ -1075,9 +1582,10 @@ class State(object):
             return
 
         if role_id not in guild._roles:
-            role = Role(**role_data)
+            role = Role._decode(role_data)
             role.guild_id = guild.id
             guild._roles[role_id] = role
+            guild._role_version += 1
         else:
             # thinking
             role = guild._roles[role_id]
@@ -1106,7 +1614,7 @@ class State(object):
         if not role:
             return
 
-        old_role = role._copy()
+        old_role = self._snapshot("role_update", role)
 
         # Update all the fields on the role.
         event_data = event_data.get("role", {})
@@ -1117,6 +1625,7 @@ class State(object):
         role.mentionable = event_data.get("mentionable")
         role.managed = event_data.get("managed")
         role.permissions = Permissions(event_data.get("permissions", 0))
+        guild._role_version += 1
 
         yield "role_update", old_role, role,
 
@@ -1134,8 +1643,10 @@ class State(object):
         if not role:
             return
 
-        # Remove the role from all members.
-        for member in guild.members.values():
+        guild._role_version += 1
+
+        # Remove the role from the members that had it.
+        for member in guild._members.remove_role(role.id):
             try:
                 member.role_ids.remove(role.id)
             except ValueError:
@@ -1206,6 +1717,9 @@ class State(object):
             await events[1].set()
             return
 
+        if not self.cache_policy.voice_states:
+            return
+
         # get the guild and member
         guild = self._guilds.get(guild_id)
 
@@ -1258,6 +1772,9 @@ class State(object):
         if channel is None:
             return
 
+        if user.id not in channel._recipients:
+            self._incref_user(user.id)
+
         channel._recipients[user.id] = user
 
         yield "group_user_add", channel, user,
@@ -1276,4 +1793,5 @@ class State(object):
 
         if user in channel.recipients.values():
             channel._recipients.pop(user.id, None)
+            self._decref_user(user.id)
             yield "group_user_remove", channel, user,
@@ -19,16 +19,57 @@ Base classes that all dataclasses inherit from.
 .. currentmodule:: curious.dataclasses.bases
 """
 import datetime
-import inspect
 import sys
 import threading
+import typing
 from contextlib import contextmanager
 
-DISCORD_EPOCH = 1420070400000
+from curious.util import DISCORD_EPOCH
 
 _allowing_external_makes = threading.local()
 _allowing_external_makes.flag = False
 
+#: The code objects of functions that have already passed the check in :meth:`.Dataclass.__new__`.
+_allowed_callers = set()
+
+
+def _check_caller(cls: type, frame) -> None:
+    """
+    Ensures that a dataclass is being made by curious, rather than by user code.
+
+    :param cls: The dataclass being made.
+    :param frame: The frame of the function making it.
+    """
+    code = frame.f_code
+    # the check only depends on the calling function, so only do it once per function
+    if code in _allowed_callers:
+        return
+
+    f_globals = frame.f_globals
+    f_name = code.co_name
+    module = f_globals.get('__name__', None)
+    file = f_globals.get('__file__', None) or ""
+
+    if module is not None:
+        if f_name == "_convert" and module.startswith("curious.commands"):
+            raise RuntimeError("You passed a dataclass ({}) as a type hint to "
+                               "your command without a converter - don't do "
+                               "this!\nThis error has been raised because no "
+                               "builtin converter exists, or the built-in "
+                               "converter has been replaced. Make sure to either "
+                               "add one or fix your code to use a converter "
+                               "function!".format(cls.__name__))
+        elif not module.startswith("curious") \
+                and f'/python3.{sys.version_info[1]}' not in file:
+            raise RuntimeError("You tried to make a dataclass manually - don't do "
+                               "this!\nThe library handles making dataclasses "
+                               "for you. If you want to get an instance, use the "
+                               "appropriate lookup method. \nIf you really need "
+                               "to make the dataclass yourself, wrap it in a "
+                               "``with allow_external_makes)``.")
+
+    _allowed_callers.add(code)
+
 
 @contextmanager
 def allow_external_makes() -> None:
@@ -83,45 +124,122 @@ class IDObject(object):
         return hash(self.id)
 
 
+class Field(typing.NamedTuple):
+    """
+    Describes how a payload decoder sets one attribute of a dataclass.
+    """
+    #: The name of the attribute to set.
+    attr: str
+
+    #: The payload key to read. If this is None, ``convert`` is called with the whole payload.
+    key: str = None
+
+    #: The value to use if the key is missing. This must be a literal, such as ``None`` or ``[]``.
+    default: typing.Any = None
+
+    #: A callable to convert the value with, or None to use the value as-is.
+    convert: typing.Callable[[typing.Any], typing.Any] = None
+
+
+def snowflake(value: typing.Union[str, int, None]) -> typing.Union[int, None]:
+    """
+    Converts a snowflake from a payload in the same way as :class:`.IDObject`.
+    """
+    if isinstance(value, str):
+        return int(value)
+
+    return value
+
+
+def make_decoder(cls: type, fields: 'typing.Iterable[Field]') \
+        -> 'typing.Callable[[dict], typing.Any]':
+    """
+    Generates a function that makes an instance of a dataclass directly from a payload dict.
+
+    The generated function sets every attribute with one line of code, so it skips the ``**kwargs``
+    unpacking and the ``kwargs.get`` chains in ``__init__``. It does the same check on its caller
+    as :meth:`.Dataclass.__new__`, and must produce the same object as ``__init__`` would.
+
+    :param cls: The class to make instances of.
+    :param fields: The :class:`.Field` objects describing each attribute, in order.
+    :return: The decoder function.
+    """
+    namespace = {"_new": object.__new__, "_cls": cls, "_external": _allowing_external_makes,
+                 "_check": _check_caller, "_getframe": sys._getframe}
+    lines = ["def decode(data):",
+             "    if _external.flag is False:",
+             "        _check(_cls, _getframe(1))",
+             "    self = _new(_cls)"]
+
+    for index, field in enumerate(fields):
+        default = repr(field.default)
+        if eval(default) != field.default:
+            raise ValueError("Default for field {} is not a literal".format(field.attr))
+
+        if field.key is None:
+            value = default
+        else:
+            value = "data.get({!r}, {})".format(field.key, default)
+
+        if field.convert is not None:
+            name = "_convert_{}".format(index)
+            namespace[name] = field.convert
+            value = "{}({})".format(name, "data" if field.key is None else value)
+
+        lines.append("    self.{} = {}".format(field.attr, value))
+
+    lines.append("    return self")
+    exec("\n".join(lines), namespace)
+
+    decode = namespace["decode"]
+    decode.__qualname__ = "{}._decode".format(cls.__qualname__)
+    return decode
+
+
 class Dataclass(IDObject):
     """
     The base class for all dataclasses.
 
     These contain a reference to the current bot as `_bot`.
+
+    Subclasses can set ``_payload_fields`` to a sequence of :class:`.Field` to have a payload
+    decoder generated for them as ``_decode``. Otherwise, ``_decode`` calls the constructor.
     """
     __slots__ = ()
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+
+        fields = cls.__dict__.get("_payload_fields")
+        if fields is not None:
+            cls._decode = staticmethod(make_decoder(cls, fields))
+        else:
+            # don't inherit a decoder made for the parent class
+            cls._decode = Dataclass.__dict__["_decode"]
+
+    @classmethod
+    def _decode(cls, data: dict) -> 'Dataclass':
+        """
+        Makes a new instance of this dataclass from a payload dict.
+        """
+        # the constructor would only see this function, so check who called it here
+        if _allowing_external_makes.flag is False:
+            _check_caller(cls, sys._getframe(1))
+
+        return cls(**data)
+
     @staticmethod
     def __new__(cls, *args, **kwargs):
         """
-        Inspects the stack to ensure we're being called correctly.
+        Inspects the calling frame to ensure we're being called correctly.
         """
         if _allowing_external_makes.flag is False:
+            # opt: sys._getframe only fetches the caller's frame object, whereas inspect.stack()
+            # walks the entire stack and reads the source lines of every frame from disk
+            frame = sys._getframe(1)
             try:
-                frameinfo = inspect.stack()[1]
-                frame = frameinfo.frame
-                f_globals = frame.f_globals
-                f_name = frame.f_code.co_name
-                module = f_globals.get('__name__', None)
-                file = f_globals.get('__file__', None)
-
-                if module is not None:
-                    if f_name == "_convert" and module.startswith("curious.commands"):
-                        raise RuntimeError("You passed a dataclass ({}) as a type hint to your "
-                                           "command without a converter - don't do this!\n"
-                                           "This error has been raised because no builtin converter"
-                                           " exists, or the built-in converter has been replaced. "
-                                           "Make sure to either add one or fix your code to use a "
-                                           "converter function!".format(cls.__name__))
-                    elif not module.startswith("curious") \
-                            and f'/python3.{sys.version_info[1]}' not in file:
-                        raise RuntimeError("You tried to make a dataclass manually - don't do this!"
-                                           "\nThe library handles making dataclasses for you. If "
-                                           "you want to get an instance, use the appropriate "
-                                           "lookup method. \nIf you really need to make the "
-                                           "dataclass yourself, wrap it in a "
-                                           "``with allow_external_makes)``.")
+                _check_caller(cls, frame)
             finally:
-                del frameinfo, frame
+                del frame
 
         return object.__new__(cls)
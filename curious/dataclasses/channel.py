@@ -18,6 +18,7 @@ Wrappers for Channel objects.
 
 .. currentmodule:: curious.dataclasses.channel
 """
+import datetime
 import enum
 import pathlib
 import time
@@ -35,10 +36,18 @@ from curious.core import current_bot
 from curious.dataclasses import guild as dt_guild, invite as dt_invite, member as dt_member, \
     message as dt_message, permissions as dt_permissions, role as dt_role, user as dt_user, \
     webhook as dt_webhook
-from curious.dataclasses.bases import Dataclass, IDObject
+from curious.dataclasses.bases import Dataclass, Field, IDObject, snowflake
 from curious.dataclasses.embed import Embed
-from curious.exc import CuriousError, ErrorCode, Forbidden, HTTPException, PermissionsError
-from curious.util import AsyncIteratorWrapper, base64ify, deprecated, safe_generator
+from curious.exc import CuriousError, ErrorCode, Forbidden, HTTPException, NotFound, \
+    PermissionsError
+from curious.util import AsyncIteratorWrapper, _PrefetchTask, base64ify, deprecated, \
+    safe_generator, to_snowflake
+
+# the administrator permission bit, which skips every overwrite
+_ADMINISTRATOR = 1 << 3
+
+# the number of members to cache resolved permissions for, per channel
+_PERMISSION_CACHE_SIZE = 256
 
 
 class ChannelType(enum.IntEnum):
@@ -86,16 +95,29 @@ class HistoryIterator(collections.AsyncIterator):
             ...
             
     Note that usage 2 will only fill chunks of 100 messages at a time.
+
+    Messages are returned newest first, unless ``after`` is provided, in which case they are
+    returned oldest first.
+
+    If ``prefetch`` is greater than zero, up to that many pages will be requested ahead of the
+    messages currently being iterated over, for as long as the ratelimit bucket has requests
+    remaining. Messages are still returned in order.
     """
 
     def __init__(self, channel: 'Channel',
                  max_messages: int = -1, *,
-                 before: int = None, after: int = None):
+                 before: int = None, after: int = None, around: int = None,
+                 before_time: datetime.datetime = None, after_time: datetime.datetime = None,
+                 prefetch: int = 0):
         """
         :param channel: The :class:`.Channel` to iterate over.
         :param max_messages: The maximum number of messages to return. <= 0 means infinite.
         :param before: The message ID to fetch before.
         :param after: The message ID to fetch after.
+        :param around: The message ID to fetch around. Only a single page is fetched.
+        :param before_time: Only return messages created before this time.
+        :param after_time: Only return messages created after this time.
+        :param prefetch: The number of pages to fetch ahead of iteration.
 
         .. versionchanged:: 0.7.0
 
@@ -124,12 +146,176 @@ class HistoryIterator(collections.AsyncIterator):
         if isinstance(self.after, IDObject):
             self.after = self.after.id
 
+        #: The message ID of around to fetch.
+        self.around = around
+        if isinstance(self.around, IDObject):
+            self.around = self.around.id
+
         #: The last message ID that we fetched.
         if self.before:
             self.last_message_id = self.before
         else:
             self.last_message_id = self.after
 
+        #: The number of pages to fetch ahead of iteration.
+        self.prefetch = max(prefetch, 0)
+
+        # snowflake bounds for the time range, if any
+        self._lower_bound = to_snowflake(after_time) if after_time is not None else None
+        self._upper_bound = to_snowflake(before_time) if before_time is not None else None
+
+        # walk upwards from ``after``, otherwise downwards from ``before`` (or the newest message)
+        self._ascending = self.after is not None and self.before is None
+        if self._ascending:
+            self._cursor = max(self.after, self._lower_bound or 0)
+        elif self.before is not None and self._upper_bound is not None:
+            self._cursor = min(self.before, self._upper_bound)
+        else:
+            self._cursor = self.before or self._upper_bound
+
+        #: The pending pages, as promises, in order. The first may still be in flight.
+        self._pages = collections.deque()  # type: _typing.Deque[multio.Promise]
+        self._prefetcher = None  # type: _PrefetchTask
+        self._fetching = False
+        self._exhausted = False
+        self._requested_count = 0
+
+        #: The number of pages fetched so far.
+        self.pages_fetched = 0
+
+        #: The number of messages fetched so far.
+        self.messages_fetched = 0
+
+        self._started_at = None  # type: float
+        self._last_fetch_at = None  # type: float
+
+    @property
+    def throughput(self) -> float:
+        """
+        :return: The number of messages fetched per second, since the first page was requested.
+        """
+        if self._started_at is None or self._last_fetch_at == self._started_at:
+            return 0.0
+
+        return self.messages_fetched / (self._last_fetch_at - self._started_at)
+
+    def _within_budget(self) -> bool:
+        """
+        :return: If another page can be fetched without waiting for the ratelimit to reset.
+        """
+        bucket = ("GET", "messages:{}".format(self.channel.id))
+        remaining = current_bot.get().http.get_ratelimit_remaining(bucket)
+        return remaining is None or remaining > 1
+
+    def _in_bounds(self, message_id: int) -> bool:
+        """
+        :return: If the specified message ID is inside the time bounds of this iterator.
+        """
+        if self._lower_bound is not None and message_id <= self._lower_bound:
+            return False
+
+        if self._upper_bound is not None and message_id >= self._upper_bound:
+            return False
+
+        return True
+
+    async def _request_page(self) -> '_typing.List[dict]':
+        """
+        Requests the next page of raw message data, in iteration order.
+        """
+        if self.max_messages > 0:
+            to_get = min(100, self.max_messages - self._requested_count)
+        else:
+            to_get = 100
+
+        if to_get <= 0:
+            self._exhausted = True
+            return []
+
+        if self._started_at is None:
+            self._started_at = time.monotonic()
+
+        http = current_bot.get().http
+        if self.around is not None:
+            page = await http.get_message_history(self.channel.id, around=self.around,
+                                                  limit=to_get)
+            # around can't be paginated
+            self._exhausted = True
+        elif self._ascending:
+            page = await http.get_message_history(self.channel.id, after=self._cursor,
+                                                  limit=to_get)
+            page.reverse()
+        else:
+            page = await http.get_message_history(self.channel.id, before=self._cursor,
+                                                  limit=to_get)
+
+        self._last_fetch_at = time.monotonic()
+        self.pages_fetched += 1
+
+        if len(page) < to_get:
+            self._exhausted = True
+
+        if page:
+            self._cursor = int(page[-1]["id"])
+
+        # cut the page off at the time bounds
+        if self._lower_bound is not None or self._upper_bound is not None:
+            in_range = [self._in_bounds(int(message["id"])) for message in page]
+            if self.around is not None:
+                page = [message for (message, ok) in zip(page, in_range) if ok]
+            elif not all(in_range):
+                # pages are in walking order, so nothing past the first miss is in range
+                page = page[:in_range.index(False)]
+                self._exhausted = True
+
+        self._requested_count += len(page)
+        self.messages_fetched += len(page)
+        return page
+
+    async def _fill_pages(self, promise: 'multio.Promise') -> None:
+        """
+        Fetches pages into the pending promises, until the prefetch window or the ratelimit
+        budget is full.
+        """
+        try:
+            while True:
+                try:
+                    page = await self._request_page()
+                except Exception as e:
+                    self._exhausted = True
+                    await promise.set(e)
+                    return
+
+                await promise.set(page)
+
+                if self._exhausted or len(self._pages) > self.prefetch \
+                        or not self._within_budget():
+                    return
+
+                promise = multio.Promise()
+                self._pages.append(promise)
+        finally:
+            self._fetching = False
+
+    async def _start_fetching(self) -> None:
+        """
+        Starts fetching a new page, in the background if prefetching is enabled.
+        """
+        if self._fetching or self._exhausted:
+            return
+
+        promise = multio.Promise()
+        self._pages.append(promise)
+        self._fetching = True
+
+        bot = current_bot.get()
+        if self.prefetch > 0 and bot.task_manager is not None:
+            self._prefetcher = _PrefetchTask()
+            await multio.asynclib.spawn(bot.task_manager, self._prefetcher.run,
+                                        self._fill_pages, promise)
+        else:
+            await self._fill_pages(promise)
+
     async def fill_messages(self) -> None:
         """
         Called to fill the next <n> messages.
@@ -137,39 +323,74 @@ class HistoryIterator(collections.AsyncIterator):
         This is called automatically by :meth:`.__anext__`, but can be used to fill the messages
         anyway.
         """
-        if self.max_messages < 0:
-            to_get = 100
-        else:
-            to_get = self.max_messages - self.current_count
+        if not self._pages:
+            await self._start_fetching()
 
-        if to_get <= 0:
+        if not self._pages:
             return
 
-        bot = current_bot.get()
-        if self.before:
-            messages = bot.http.get_message_history(self.channel.id, before=self.last_message_id,
-                                                    limit=to_get)
-        else:
-            messages =  bot.http.get_message_history(self.channel.id, after=self.last_message_id)
-            messages = reversed(messages)
+        page = await self._pages[0].wait()
+        self._pages.popleft()
+        if isinstance(page, Exception):
+            raise page
 
-        for message in messages:
+        # keep the pipeline topped up whilst these messages are consumed
+        if self.prefetch > 0:
+            await self._start_fetching()
+
+        bot = current_bot.get()
+        for message in page:
             self.messages.append(bot.state.make_message(message))
 
+    async def aclose(self) -> None:
+        """
+        Stops this iterator, cancelling any pages that are still being prefetched.
+
+        This is called automatically once iteration finishes, or when this iterator is used as an
+        async context manager:
+
+        .. code-block:: python3
+
+            async with channel.messages.get_history(prefetch=2) as history:
+                async for message in history:
+                    if message.content == "stop":
+                        break
+        """
+        self._exhausted = True
+        self._pages.clear()
+
+        if self._prefetcher is not None:
+            await self._prefetcher.cancel()
+            self._prefetcher = None
+
+    async def __aenter__(self) -> 'HistoryIterator':
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> bool:
+        await self.aclose()
+        return False
+
     async def __anext__(self) -> 'dt_message.Message':
-        self.current_count += 1
-        if self.current_count == self.max_messages:
+        if 0 < self.max_messages <= self.current_count:
+            await self.aclose()
             raise StopAsyncIteration
 
         if len(self.messages) <= 0:
-            await self.fill_messages()
+            try:
+                await self.fill_messages()
+            except Exception:
+                await self.aclose()
+                raise
 
         try:
             message = self.messages.popleft()
         except IndexError:
             # No messages to fill, so self._fill_messages didn't return any
             # This signals the end of iteration.
+            await self.aclose()
             raise StopAsyncIteration
+
+        self.current_count += 1
         self.last_message_id = message.id
 
         return message
@@ -192,8 +413,9 @@ class HistoryIterator(collections.AsyncIterator):
         """
         items = []
 
-        async for item in self:
-            items.append(item)
+        async with self:
+            async for item in self:
+                items.append(item)
 
         return items
 
@@ -222,9 +444,21 @@ class ChannelMessageWrapper(object):
         """
         return self.get_history(before=self.channel._last_message_id, limit=-1)
 
+    @property
+    def cached(self) -> '_typing.List[dt_message.Message]':
+        """
+        :return: A list of the :class:`.Message` objects from this channel that are currently \
+            in the message cache, oldest first.
+        """
+        return current_bot.get().state.messages.for_channel(self.channel.id)
+
     def get_history(self, before: int = None,
                     after: int = None,
-                    limit: int = 100) -> HistoryIterator:
+                    limit: int = 100, *,
+                    around: int = None,
+                    before_time: datetime.datetime = None,
+                    after_time: datetime.datetime = None,
+                    prefetch: int = 0) -> HistoryIterator:
         """
         Gets history for this channel.
 
@@ -239,12 +473,18 @@ class ChannelMessageWrapper(object):
         :param limit: The maximum number of messages to get.
         :param before: The snowflake ID to get messages before.
         :param after: The snowflake ID to get messages after.
+        :param around: The snowflake ID to get messages around.
+        :param before_time: Only get messages created before this time.
+        :param after_time: Only get messages created after this time.
+        :param prefetch: The number of pages to fetch ahead of iteration.
         """
         if self.channel.guild:
             if not self.channel.permissions(self.channel.guild.me).read_message_history:
                 raise PermissionsError("read_message_history")
 
-        return HistoryIterator(self.channel, before=before, after=after, max_messages=limit)
+        return HistoryIterator(self.channel, before=before, after=after, around=around,
+                               before_time=before_time, after_time=after_time,
+                               max_messages=limit, prefetch=prefetch)
 
     async def send(self, content: str = None, *,
                    tts: bool = False, embed: 'Embed' = None) -> 'dt_message.Message':
@@ -402,12 +642,17 @@ class ChannelMessageWrapper(object):
                     author: 'dt_member.Member' = None,
                     content: str = None,
                     predicate: '_typing.Callable[[dt_message.Message], bool]' = None,
-                    fallback_from_bulk: bool = False):
+                    fallback_from_bulk: bool = False,
+                    progress: '_typing.Callable[[int, int], None]' = None) -> int:
         """
         Purges messages from a channel.
         This will attempt to use ``bulk-delete`` if possible, but otherwise will use the normal
         delete endpoint (which can get ratelimited severely!) if ``fallback_from_bulk`` is True.
 
+        Messages are deleted while the history is still being scanned, in chunks of up to 100.
+        Messages older than 14 days cannot be bulk deleted, so they are deleted one at a time in
+        the background instead.
+
         Example for deleting all messages owned by the bot:
 
         .. code-block:: python3
@@ -426,12 +671,18 @@ class ChannelMessageWrapper(object):
             await channel.messages.purge(limit=100,
                                          predicate=lambda message: 'i' in message.content)
 
-        :param limit: The maximum amount of messages to delete. -1 for unbounded size.
+        .. versionchanged:: 1.0.0
+
+            Messages older than 14 days are now deleted individually instead of raising.
+
+        :param limit: The maximum amount of messages to scan. -1 for unbounded size.
         :param author: Only delete messages made by this author.
         :param content: Only delete messages that exactly match this content.
         :param predicate: A callable that determines if a message should be deleted.
         :param fallback_from_bulk: If this is True, messages will be regular deleted if they \
             cannot be bulk deleted.
+        :param progress: A callable that is called with the number of messages scanned and the \
+            number of messages deleted so far, every time messages are deleted.
         :return: The number of messages deleted.
         """
         if self.channel.guild:
@@ -449,47 +700,85 @@ class ChannelMessageWrapper(object):
         if predicate:
             checks.append(predicate)
 
-        to_delete = []
-        history = self.get_history(limit=limit)
+        bot = current_bot.get()
+        minimum_allowed = to_snowflake(datetime.datetime.utcnow() - datetime.timedelta(days=14))
+        # messages that have to go through the single-message delete endpoint
+        # this is bounded so that a slow lane applies backpressure to the history scan
+        single_deletes = multio.Queue(100)
+        can_bulk_delete = True
+        scanned = 0
+        deleted = 0
+        chunk = []
 
-        async for message in history:
-            if all(check(message) for check in checks):
-                to_delete.append(message)
+        def report():
+            if progress is not None:
+                progress(scanned, deleted)
 
-        can_bulk_delete = True
+        async def delete_singly():
+            nonlocal deleted
 
-        # Split into chunks of 100.
-        message_chunks = [to_delete[i:i + 100] for i in range(0, len(to_delete), 100)]
-        minimum_allowed = floor((time.time() - 14 * 24 * 60 * 60) * 1000.0 - 1420070400000) << 22
-        for chunk in message_chunks:
-            message_ids = []
-            for message in chunk:
-                if message.id < minimum_allowed:
-                    msg = f"Cannot delete message id {message.id} older than {minimum_allowed}"
-                    raise CuriousError(msg)
+            # the http client already waits out the bucket once it's exhausted, and deleting
+            # sequentially here means we never have more than one request queued on it
+            while True:
+                message = await single_deletes.get()
+                if message is None:
+                    return
+
+                try:
+                    await bot.http.delete_message(self.channel.id, message.id)
+                except NotFound:
+                    # someone else deleted it first
+                    continue
 
-                message_ids.append(message.id)
+                deleted += 1
+                report()
 
-            # First, try and bulk delete all the messages.
-            if can_bulk_delete:
+        async def flush():
+            nonlocal can_bulk_delete, deleted, chunk
+            to_delete, chunk = chunk, []
+
+            # bulk-delete refuses to delete a single message
+            if can_bulk_delete and len(to_delete) > 1:
                 try:
-                    await current_bot.get().http.delete_multiple_messages(self.channel.id,
-                                                                          message_ids)
+                    await bot.http.delete_multiple_messages(self.channel.id,
+                                                            [m.id for m in to_delete])
                 except Forbidden:
                     # We might not have MANAGE_MESSAGES.
                     # Check if we should fallback on normal delete.
                     can_bulk_delete = False
                     if not fallback_from_bulk:
-                        # Don't bother, actually.
                         raise
+                else:
+                    deleted += len(to_delete)
+                    report()
+                    return
+
+            for message in to_delete:
+                await single_deletes.put(message)
 
-            # This is an `if not` instead of an `else` because `can_bulk_delete` might've changed.
-            if not can_bulk_delete:
-                # Instead, just delete() the message.
-                for message in chunk:
-                    await message.delete()
+        async with multio.asynclib.task_manager() as tg:
+            await multio.asynclib.spawn(tg, delete_singly)
+
+            # prefetch one page so that the next history request overlaps with the bulk delete
+            async with self.get_history(limit=limit, prefetch=1) as history:
+                async for message in history:
+                    scanned += 1
+                    if not all(check(message) for check in checks):
+                        continue
+
+                    if message.id < minimum_allowed or not can_bulk_delete:
+                        await single_deletes.put(message)
+                        continue
+
+                    chunk.append(message)
+                    if len(chunk) >= 100:
+                        await flush()
+
+            await flush()
+            await single_deletes.put(None)
 
-        return len(to_delete)
+        report()
+        return deleted
 
     async def get(self, message_id: int) -> 'dt_message.Message':
         """
@@ -526,11 +815,53 @@ class ChannelMessageWrapper(object):
         return msg
 
 
+def _decode_recipients(data: dict) -> '_typing.Dict[int, dt_user.User]':
+    """
+    Makes the recipients of a private channel from a channel payload.
+    """
+    recipients = {}
+    if int(data.get("guild_id", 0)):
+        return recipients
+
+    bot = current_bot.get()
+    for recipient in data.get("recipients", []):
+        u = bot.state.make_user(recipient)
+        recipients[u.id] = u
+
+    if ChannelType(data.get("type", 0)) == ChannelType.GROUP:
+        # append the current user
+        recipients[bot.user.id] = bot.user
+
+    return recipients
+
+
 class Channel(Dataclass):
     """
     Represents a channel object.
     """
 
+    # keep in sync with __init__
+    _payload_fields = (
+        Field("id", "id", convert=snowflake),
+        Field("name", "name"),
+        Field("topic", "topic"),
+        Field("guild_id", "guild_id", 0, convert=lambda value: int(value) or None),
+        Field("parent_id", "parent_id",
+              convert=lambda value: None if value is None else int(value)),
+        Field("type", "type", 0, convert=lambda value: ChannelType(value)),
+        Field("_messages"),
+        Field("nsfw", "nsfw", False),
+        Field("_recipients", convert=_decode_recipients),
+        Field("position", "position", 0),
+        Field("_last_message_id", "last_message_id", 0,
+              convert=lambda value: int(value) if value else None),
+        Field("owner_id", "owner_id", 0, convert=lambda value: int(value) or None),
+        Field("icon_hash", "icon"),
+        Field("_overwrites", default={}),
+        Field("_permission_cache", convert=lambda data: collections.OrderedDict()),
+        Field("_permission_version", default=-1),
+    )
+
     def __init__(self, **kwargs) -> None:
         super().__init__(kwargs.get("id"))
 
@@ -560,16 +891,7 @@ class Channel(Dataclass):
         self.nsfw = kwargs.get("nsfw", False)  # type: bool
 
         #: If private, the mapping of :class:`.User` that are in this channel.
-        self._recipients = {}  # type: _typing.Dict[int, dt_user.User]
-
-        if self.private:
-            for recipient in kwargs.get("recipients", []):
-                u = current_bot.get().state.make_user(recipient)
-                self._recipients[u.id] = u
-
-            if self.type == ChannelType.GROUP:
-                # append the current user
-                self._recipients[current_bot.get().user.id] = current_bot.get().user
+        self._recipients = _decode_recipients(kwargs)  # type: _typing.Dict[int, dt_user.User]
 
         #: The position of this channel.
         self.position = kwargs.get("position", 0)  # type: int
@@ -595,6 +917,11 @@ class Channel(Dataclass):
         #: The internal overwrites for this channel.
         self._overwrites = {}  # type: _typing.Dict[int, dt_permissions.Overwrite]
 
+        # member ID -> (member version, permission bitfield), least recently used first
+        # this is thrown away whenever the overwrites or the guild's roles change
+        self._permission_cache = collections.OrderedDict()  # type: _typing.Dict[int, tuple]
+        self._permission_version = -1
+
     def __repr__(self) -> str:
         return f"<Channel id={self.id} name={self.name} type={self.type.name} " \
                f"guild_id={self.guild_id}>"
@@ -611,6 +938,7 @@ class Channel(Dataclass):
             raise CuriousError("A channel without a guild cannot have overwrites")
 
         self._overwrites = {}
+        self._permission_cache.clear()
 
         for overwrite in overwrites:
             id_ = int(overwrite["id"])
@@ -619,11 +947,11 @@ class Channel(Dataclass):
             if type_ == "member":
                 obb = self.guild._members.get(id_)
             else:
-                obb = self.guild._members.get(id_)
+                obb = self.guild._roles.get(id_)
 
-            self._overwrites[id] = dt_permissions.Overwrite(allow=overwrite["allow"],
-                                                            deny=overwrite["deny"],
-                                                            obb=obb, channel_id=self.id)
+            self._overwrites[id_] = dt_permissions.Overwrite(allow=overwrite["allow"],
+                                                             deny=overwrite["deny"],
+                                                             obb=obb, channel_id=self.id)
 
     @property
     def guild(self) -> '_typing.Union[dt_guild.Guild, None]':
@@ -773,6 +1101,66 @@ class Channel(Dataclass):
 
         return overwrite
 
+    def _permission_bits(self, member: 'dt_member.Member') -> int:
+        """
+        Resolves the permission bitfield of a member in this channel.
+
+        This follows Discord's order: the guild permissions of the member, then the ``@everyone``
+        overwrite, then the role overwrites of the member combined, then the member's overwrite.
+        """
+        guild = self.guild
+        if guild is None:
+            raise CuriousError("A channel without a guild cannot have overwrites")
+
+        cache = self._permission_cache
+        if self._permission_version != guild._role_version:
+            # every entry is stale once the roles change
+            cache.clear()
+            self._permission_version = guild._role_version
+
+        cached = cache.get(member.id)
+        if cached is not None and cached[0] == member._version:
+            cache.move_to_end(member.id)
+            return cached[1]
+
+        # owners and administrators get every permission from this already
+        bits = member.guild_permissions.bitfield
+        if not bits & _ADMINISTRATOR:
+            overwrites = self._overwrites
+
+            overwrite = overwrites.get(guild.id)
+            if overwrite is not None:
+                bits = (bits & ~overwrite.deny.bitfield) | overwrite.allow.bitfield
+
+            allow = deny = 0
+            for role_id in member._role_ids:
+                overwrite = overwrites.get(role_id)
+                if overwrite is not None:
+                    allow |= overwrite.allow.bitfield
+                    deny |= overwrite.deny.bitfield
+
+            bits = (bits & ~deny) | allow
+
+            overwrite = overwrites.get(member.id)
+            if overwrite is not None:
+                bits = (bits & ~overwrite.deny.bitfield) | overwrite.allow.bitfield
+
+        cache[member.id] = (member._version, bits)
+        if len(cache) > _PERMISSION_CACHE_SIZE:
+            cache.popitem(last=False)
+
+        return bits
+
+    def effective_permissions(self, member: 'dt_member.Member') -> 'dt_permissions.Permissions':
+        """
+        Gets the permissions the specified member has in this channel, after applying the
+        ``@everyone``, role and member overwrites.
+
+        :param member: The :class:`.Member` to get the permissions of.
+        :return: A :class:`.Permissions` for the member in this channel.
+        """
+        return dt_permissions.Permissions(self._permission_bits(member))
+
     @property
     def me_permissions(self) -> 'dt_permissions.Overwrite':
         """
@@ -792,6 +1180,9 @@ class Channel(Dataclass):
         obb.topic = self.topic
         obb.position = self.position
         obb.parent_id = self.parent_id
+        obb._overwrites = self._overwrites
+        obb._permission_cache = collections.OrderedDict()
+        obb._permission_version = -1
         return obb
 
     @deprecated(since="0.7.0", see_instead="Channel.messages.get_history", removal="0.9.0")
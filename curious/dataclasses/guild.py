@@ -19,9 +19,12 @@ Wrappers for Guild objects.
 .. currentmodule:: curious.dataclasses.guild
 """
 import abc
-import copy
+import array
+import bisect
 import datetime
 import enum
+import functools
+import math
 import sys
 import typing
 from dataclasses import dataclass
@@ -30,6 +33,7 @@ from os import PathLike
 from types import MappingProxyType
 
 import collections
+import collections.abc
 import multio
 
 from curious.core import current_bot
@@ -38,9 +42,9 @@ from curious.dataclasses import channel as dt_channel, emoji as dt_emoji, invite
     member as dt_member, permissions as dt_permissions, role as dt_role, \
     search as dt_search, user as dt_user, voice_state as dt_vs, webhook as dt_webhook
 from curious.dataclasses.bases import Dataclass
-from curious.dataclasses.presence import Presence, Status
+from curious.dataclasses.presence import Status
 from curious.exc import CuriousError, HTTPException, HierarchyError, PermissionsError
-from curious.util import AsyncIteratorWrapper, base64ify, deprecated
+from curious.util import AsyncIteratorWrapper, base64ify, deprecated, to_datetime
 
 default_var = typing.TypeVar("T")
 
@@ -227,12 +231,14 @@ class GuildChannelWrapper(_WrapperBase):
         :param default: The default value to get, if the channel cannot be found.
         :return: A :class:`.Channel` if it can be found.
         """
-        s = sorted(self._channels.values(), key=lambda c: c.position)
-        try:
-            return next(filter(lambda ch: ch.name == name, s))
-        except StopIteration:
+        channels = self._channels
+        matches = [channels[channel_id] for channel_id in self._guild._channel_names().get(name)
+                   if channel_id in channels and channels[channel_id].name == name]
+        if not matches:
             return default
 
+        return min(matches, key=lambda c: c.position)
+
     async def create(self, name: str, type_: 'dt_channel.ChannelType' = None,
                      permission_overwrites: 'typing.List[dt_permissions.Overwrite]' = None,
                      *,
@@ -377,12 +383,14 @@ class GuildRoleWrapper(_WrapperBase):
         :param default: The default value to get, if the role cannot be found.
         :return: A :class:`.Role` if it can be found.
         """
-        s = sorted(self._roles.values(), key=lambda c: c.position)
-        try:
-            return next(filter(lambda r: r.name == name, s))
-        except StopIteration:
+        roles = self._roles
+        matches = [roles[role_id] for role_id in self._guild._role_names().get(name)
+                   if role_id in roles and roles[role_id].name == name]
+        if not matches:
             return default
 
+        return min(matches, key=lambda r: r.position)
+
     async def create(self, **kwargs) -> 'dt_role.Role':
         """
         Creates a new role in this guild.
@@ -395,6 +403,7 @@ class GuildRoleWrapper(_WrapperBase):
         role_obb = dt_role.Role(**(await current_bot.get().http.create_role(self._guild.id)))
         self._roles[role_obb.id] = role_obb
         role_obb.guild_id = self._guild.id
+        self._guild._role_version += 1
         return await role_obb.edit(**kwargs)
 
     def edit(self, role: 'dt_role.Role', **kwargs):
@@ -618,6 +627,643 @@ class GuildBanContainer(object):
         return [ban async for ban in self]
 
 
+#: The set bits of every possible byte, used to turn a bitset back into row numbers.
+_BYTE_BITS = tuple(tuple(bit for bit in range(8) if byte >> bit & 1) for byte in range(256))
+
+#: The status codes stored in a :class:`.MemberStore`. Empty rows use ``_NO_STATUS``.
+_STATUS_CODES = {status: code for code, status in enumerate(Status)}
+_NO_STATUS = 255
+_OFFLINE = _STATUS_CODES[Status.OFFLINE]
+_STATUSES = list(Status)
+
+_EPOCH = datetime.datetime(1970, 1, 1)
+
+
+def _iter_rows(bits: bytes) -> typing.Generator[int, None, None]:
+    for index, byte in enumerate(bits):
+        if byte:
+            base = index << 3
+            for bit in _BYTE_BITS[byte]:
+                yield base + bit
+
+
+class _NameIndex(object):
+    """
+    A case-folded index of names to IDs, with prefix search.
+
+    Lookups only give candidates; callers check the names of what they get back, so that an entry
+    for an old name which was never removed is harmless.
+    """
+
+    __slots__ = "_ids", "_sorted"
+
+    def __init__(self):
+        #: The IDs for each folded name. This is a single ID, or a list if the name is shared.
+        self._ids = {}  # type: typing.Dict[str, typing.Union[int, typing.List[int]]]
+        #: The sorted folded names, for prefix search. None until needed, or if a name was added.
+        self._sorted = None  # type: typing.List[str]
+
+    def add(self, name: str, id_: int):
+        if not name:
+            return
+
+        key = name.casefold()
+        ids = self._ids.get(key)
+        if ids is None:
+            self._ids[key] = id_
+            self._sorted = None
+        elif isinstance(ids, list):
+            if id_ not in ids:
+                ids.append(id_)
+        elif ids != id_:
+            self._ids[key] = [ids, id_]
+
+    def remove(self, name: str, id_: int):
+        if not name:
+            return
+
+        key = name.casefold()
+        ids = self._ids.get(key)
+        if isinstance(ids, list):
+            if id_ in ids:
+                ids.remove(id_)
+            if len(ids) == 1:
+                self._ids[key] = ids[0]
+        elif ids == id_:
+            del self._ids[key]
+
+    def get(self, name: str) -> typing.List[int]:
+        ids = self._ids.get(name.casefold())
+        if ids is None:
+            return []
+
+        return list(ids) if isinstance(ids, list) else [ids]
+
+    def starting_with(self, prefix: str) -> typing.Generator[int, None, None]:
+        if self._sorted is None:
+            self._sorted = sorted(self._ids)
+
+        keys, prefix = self._sorted, prefix.casefold()
+        for index in range(bisect.bisect_left(keys, prefix), len(keys)):
+            key = keys[index]
+            if not key.startswith(prefix):
+                break
+
+            ids = self._ids.get(key)
+            if isinstance(ids, list):
+                yield from ids
+            elif ids is not None:
+                yield ids
+
+
+#: The number of requests the bulk moderation methods keep in flight at once.
+_BULK_CONCURRENCY = 8
+
+
+class MemberStore(collections.abc.MutableMapping):
+    """
+    The members of a :class:`.Guild`, keyed by member ID.
+
+    Members are held in columns, one row per member: the ID, the status code, the join time and
+    one bit in a bitset per role, plus the user, nickname and game of the member. The members that
+    arrive in bulk (in ``GUILD_CREATE`` and member chunks) are only stored in the columns, and a
+    :class:`.Member` is only made the first time it is looked up. It is kept from then on, so that
+    the same object is returned every time and changes to it are not lost.
+
+    Queries work over the columns, and only the members that match are looked up (and made).
+    Iterating over every member, e.g. with ``values()``, makes every member. The number of members
+    with each status, and the members that are not offline, are kept up to date as members are
+    stored, removed and change status.
+
+    Rows are reused when members are removed. Status and role changes must go through
+    :meth:`.MemberStore.update_status` and :meth:`.MemberStore.set_roles` to be seen by queries.
+
+    The store also keeps case-folded indexes of usernames and nicknames, which are made the first
+    time a member is looked up by name. Name changes must go through
+    :meth:`.MemberStore.set_nickname` and :meth:`.MemberStore.rename_user`.
+    """
+
+    __slots__ = "_guild_id", "_rows", "_made", "_ids", "_free", "_live", "_statuses", \
+                "_status_counts", "_status_members", "_status_unmade", "_joined", "_joined_raw", "_users", "_nicks", \
+                "_games", "_roles", "_usernames", "_nicknames"
+
+    def __init__(self, guild_id: int = None):
+        #: The ID of the guild these members are in.
+        self._guild_id = guild_id
+        #: The row of each member ID.
+        self._rows = {}  # type: typing.Dict[int, int]
+        #: The members that have been made so far.
+        self._made = {}  # type: typing.Dict[int, dt_member.Member]
+
+        #: The member ID for each row, or 0 if the row is free.
+        self._ids = array.array("Q")
+        #: The free rows, to be reused.
+        self._free = []  # type: typing.List[int]
+        #: The bitset of rows in use.
+        self._live = bytearray()
+        #: The status code for each row.
+        self._statuses = bytearray()
+        #: The number of rows with each status code.
+        self._status_counts = [0] * len(_STATUS_CODES)
+        #: The members with each status code, apart from offline, which most members are.
+        self._status_members = {code: {} for code in _STATUS_CODES.values() if code != _OFFLINE} \
+            # type: typing.Dict[int, typing.Dict[int, dt_member.Member]]
+        #: The IDs of the members with each status code that haven't been made yet.
+        self._status_unmade = {code: set() for code in self._status_members} \
+            # type: typing.Dict[int, typing.Set[int]]
+        #: The join time for each row, as a UTC timestamp. NaN until a query needs it.
+        self._joined = array.array("d")
+        #: The bitset of rows for each role ID.
+        self._roles = {}  # type: typing.Dict[int, bytearray]
+
+        # the data for rows that haven't been made into a member yet
+        #: The raw join time for each row.
+        self._joined_raw = []  # type: typing.List[str]
+        #: The user for each row.
+        self._users = []  # type: typing.List[dt_user.User]
+        #: The nickname and game of the rows that have one.
+        self._nicks = {}  # type: typing.Dict[int, str]
+        self._games = {}  # type: typing.Dict[int, dict]
+
+        #: The username and nickname indexes. None until a member is looked up by name.
+        self._usernames = None  # type: _NameIndex
+        self._nicknames = None  # type: _NameIndex
+
+    # mapping interface
+    def __getitem__(self, key: int) -> 'dt_member.Member':
+        member = self._made.get(key)
+        if member is None:
+            member = self._make(key, self._rows[key])
+
+        return member
+
+    def __contains__(self, key: int) -> bool:
+        return key in self._rows
+
+    def __iter__(self) -> typing.Iterator[int]:
+        return iter(self._rows)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __setitem__(self, key: int, member: 'dt_member.Member'):
+        old = self._made.get(key)
+        if old is member:
+            return
+
+        row = self._rows.get(key)
+        if row is not None:
+            self._unindex_names(key, row)
+            self._clear_row(key, row)
+        else:
+            row = self._new_row(key)
+
+        self._made[key] = member
+        member._row = row
+        self._set_status(row, _STATUS_CODES[member.presence.status], key)
+        self._index_roles(member.role_ids, row)
+        self._index_names(key, row)
+
+    def __delitem__(self, key: int):
+        self._release(key, self._rows[key])
+
+    def pop(self, key: int, *default):
+        row = self._rows.get(key)
+        if row is None:
+            if default:
+                return default[0]
+
+            raise KeyError(key)
+
+        # this is usually handed to an event, so it has to be made
+        member = self[key]
+        self._release(key, row)
+        return member
+
+    def clear(self):
+        self.__init__(self._guild_id)
+
+    def _add_payload(self, data: dict, user: 'dt_user.User'):
+        """
+        Stores a member from a member payload, without making a :class:`.Member` for it.
+
+        :param data: The member payload.
+        :param user: The :class:`.User` of the member.
+        """
+        key = user.id
+        row = self._rows.get(key)
+        if row is not None:
+            self._unindex_names(key, row)
+            self._clear_row(key, row)
+        else:
+            row = self._new_row(key)
+
+        self._users[row] = user
+        self._joined_raw[row] = data.get("joined_at")
+        nick = data.get("nick")
+        if nick is not None:
+            self._nicks[key] = nick
+
+        status, game = data.get("status"), data.get("game")
+        if game:
+            self._games[key] = game
+
+        code = _STATUS_CODES[Status(status)] if status else _OFFLINE
+        self._set_status(row, code, key)
+        self._index_roles(map(int, data.get("roles", ())), row)
+        self._index_names(key, row)
+
+    def _make(self, key: int, row: int) -> 'dt_member.Member':
+        member = object.__new__(dt_member.Member)  # type: dt_member.Member
+        member.id = key
+        member._user = self._users[row]
+        member._role_ids = array.array("Q", self._row_roles(row))
+        member._joined_at = self._joined_raw[row]
+        member._nick = self._nicks.pop(key, None)
+        member.guild_id = self._guild_id
+        member.presence = dt_member._make_presence(_STATUSES[self._statuses[row]],
+                                                   self._games.pop(key, None))
+        member._version = next(dt_member._versions)
+        member._cache = None
+        member._row = row
+
+        # the member holds all of this now
+        self._users[row] = None
+        self._joined_raw[row] = None
+        self._made[key] = member
+
+        code = self._statuses[row]
+        if code in self._status_members:
+            self._status_unmade[code].discard(key)
+            self._status_members[code][key] = member
+
+        return member
+
+    # rows
+    def _new_row(self, key: int) -> int:
+        if self._free:
+            row = self._free.pop()
+        else:
+            row = len(self._ids)
+            self._ids.append(0)
+            self._statuses.append(_NO_STATUS)
+            self._joined.append(math.nan)
+            self._joined_raw.append(None)
+            self._users.append(None)
+            if row & 7 == 0:
+                self._live.append(0)
+
+        self._rows[key] = row
+        self._ids[row] = key
+        self._live[row >> 3] |= 1 << (row & 7)
+        return row
+
+    def _clear_row(self, key: int, row: int):
+        self._made.pop(key, None)
+        self._nicks.pop(key, None)
+        self._games.pop(key, None)
+        self._users[row] = None
+        self._joined_raw[row] = None
+        self._joined[row] = math.nan
+
+        index, mask = row >> 3, ~(1 << (row & 7)) & 0xFF
+        for bits in self._roles.values():
+            if index < len(bits):
+                bits[index] &= mask
+
+    def _release(self, key: int, row: int):
+        self._unindex_names(key, row)
+        self._clear_row(key, row)
+        self._set_status(row, _NO_STATUS, key)
+        del self._rows[key]
+        self._ids[row] = 0
+        self._live[row >> 3] &= ~(1 << (row & 7)) & 0xFF
+        self._free.append(row)
+
+    def _row_roles(self, row: int) -> typing.List[int]:
+        index, bit = row >> 3, 1 << (row & 7)
+        return [role_id for (role_id, bits) in self._roles.items()
+                if index < len(bits) and bits[index] & bit]
+
+    def _set_status(self, row: int, code: int, key: int):
+        old = self._statuses[row]
+        if old != code:
+            if old != _NO_STATUS:
+                self._status_counts[old] -= 1
+            if code != _NO_STATUS:
+                self._status_counts[code] += 1
+
+            self._statuses[row] = code
+
+        if old in self._status_members:
+            self._status_members[old].pop(key, None)
+            self._status_unmade[old].discard(key)
+
+        # re-added even if the status is the same, as the member object may have been replaced
+        if code in self._status_members:
+            member = self._made.get(key)
+            if member is None:
+                self._status_unmade[code].add(key)
+            else:
+                self._status_members[code][key] = member
+
+    def _index_roles(self, role_ids: typing.Iterable[int], row: int):
+        roles = self._roles
+        index, bit = row >> 3, 1 << (row & 7)
+        for role_id in role_ids:
+            bits = roles.get(role_id)
+            if bits is None:
+                bits = roles[role_id] = bytearray()
+
+            if index >= len(bits):
+                bits.extend(bytes(index - len(bits) + 1))
+
+            bits[index] |= bit
+
+    def _unindex_roles(self, role_ids: typing.Iterable[int], row: int):
+        roles = self._roles
+        index, mask = row >> 3, ~(1 << (row & 7)) & 0xFF
+        for role_id in role_ids:
+            bits = roles.get(role_id)
+            if bits is not None and index < len(bits):
+                bits[index] &= mask
+
+    # names
+    def _names(self, key: int, row: int) -> typing.Tuple[str, str]:
+        member = self._made.get(key)
+        if member is not None:
+            return member.user.username, member._nick
+
+        return self._users[row].username, self._nicks.get(key)
+
+    def _index_names(self, key: int, row: int):
+        if self._usernames is not None:
+            username, nick = self._names(key, row)
+            self._usernames.add(username, key)
+            self._nicknames.add(nick, key)
+
+    def _unindex_names(self, key: int, row: int):
+        if self._usernames is not None:
+            username, nick = self._names(key, row)
+            self._usernames.remove(username, key)
+            self._nicknames.remove(nick, key)
+
+    def _name_indexes(self) -> 'typing.Tuple[_NameIndex, _NameIndex]':
+        if self._usernames is None:
+            self._usernames, self._nicknames = _NameIndex(), _NameIndex()
+            for key, row in self._rows.items():
+                self._index_names(key, row)
+
+        return self._usernames, self._nicknames
+
+    def _is_stored(self, member: 'dt_member.Member') -> bool:
+        return self._made.get(member.id) is member
+
+    # column updates
+    def update_status(self, member: 'dt_member.Member'):
+        """
+        Updates the stored status of a member, after its presence has changed.
+
+        :param member: The :class:`.Member` to update. Ignored if not in this store.
+        """
+        if self._is_stored(member):
+            self._set_status(member._row, _STATUS_CODES[member.presence.status], member.id)
+
+    def set_presence(self, member_id: int, status: str, game: dict = None) -> bool:
+        """
+        Sets the presence of a member, without making a :class:`.Member` for it if one hasn't
+        been made yet.
+
+        :param member_id: The ID of the member.
+        :param status: The new status of the member.
+        :param game: The new game of the member, if any.
+        :return: If the member is in this store.
+        """
+        member = self._made.get(member_id)
+        if member is not None:
+            member.presence = dt_member._make_presence(status, game)
+            self.update_status(member)
+            return True
+
+        row = self._rows.get(member_id)
+        if row is None:
+            return False
+
+        if game:
+            self._games[member_id] = game
+        else:
+            self._games.pop(member_id, None)
+
+        self._set_status(row, _STATUS_CODES[Status(status)] if status else _OFFLINE, member_id)
+        return True
+
+    def set_roles(self, member: 'dt_member.Member', role_ids: typing.Iterable[int]):
+        """
+        Sets the role IDs of a member, keeping the role bitsets up to date.
+
+        :param member: The :class:`.Member` to update.
+        :param role_ids: The new role IDs of the member.
+        """
+        if not self._is_stored(member):
+            member.role_ids = role_ids
+            return
+
+        self._unindex_roles(member.role_ids, member._row)
+        member.role_ids = role_ids
+        self._index_roles(member.role_ids, member._row)
+
+    def set_nickname(self, member: 'dt_member.Member', nickname: str):
+        """
+        Sets the nickname of a member, keeping the nickname index up to date.
+
+        :param member: The :class:`.Member` to update.
+        :param nickname: The new nickname of the member.
+        """
+        if self._nicknames is None or not self._is_stored(member):
+            member.nickname = nickname
+            return
+
+        self._nicknames.remove(member._nick, member.id)
+        member.nickname = nickname
+        self._nicknames.add(member._nick, member.id)
+
+    def _set_nickname(self, member_id: int, nickname: str):
+        """
+        Sets the nickname of a stored member by ID, without making a :class:`.Member` for it.
+        """
+        member = self._made.get(member_id)
+        if member is not None:
+            self.set_nickname(member, nickname)
+            return
+
+        if self._nicknames is not None:
+            self._nicknames.remove(self._nicks.get(member_id), member_id)
+            self._nicknames.add(nickname, member_id)
+
+        if nickname is None:
+            self._nicks.pop(member_id, None)
+        else:
+            self._nicks[member_id] = nickname
+
+    def rename_user(self, member: 'dt_member.Member', old_username: str):
+        """
+        Updates the username index, after the user of a member has changed name.
+
+        :param member: The :class:`.Member` whose user was renamed.
+        :param old_username: The previous username of the user.
+        """
+        if self._usernames is not None and self._is_stored(member):
+            self._usernames.remove(old_username, member.id)
+            self._usernames.add(member.user.username, member.id)
+
+    def remove_role(self, role_id: int) -> 'typing.List[dt_member.Member]':
+        """
+        Drops the bitset for a deleted role.
+
+        :param role_id: The ID of the role.
+        :return: The members that had the role and have already been made. The others lose it \
+            with the bitset.
+        """
+        made, ids = self._made, self._ids
+        members = (made.get(ids[row]) for row in _iter_rows(self._roles.pop(role_id, b"")))
+        return [member for member in members if member is not None]
+
+    # bitset helpers
+    def _role_mask(self, role_id: int) -> int:
+        return int.from_bytes(self._roles.get(role_id, b""), "little")
+
+    def _live_mask(self) -> int:
+        return int.from_bytes(self._live, "little")
+
+    def _from_mask(self, mask: typing.Union[int, bytes]) \
+            -> 'typing.Generator[dt_member.Member, None, None]':
+        if isinstance(mask, int):
+            mask = mask.to_bytes((mask.bit_length() + 7) // 8, "little")
+        else:
+            mask = bytes(mask)
+
+        ids, made = self._ids, self._made
+        for row in _iter_rows(mask):
+            member_id = ids[row]
+            if member_id:
+                yield made.get(member_id) or self._make(member_id, row)
+
+    # queries
+    def count_status(self, status: Status) -> int:
+        """
+        :param status: The :class:`.Status` to count.
+        :return: The number of members with the specified status.
+        """
+        return self._status_counts[_STATUS_CODES[status]]
+
+    def with_status(self, status: Status) -> 'typing.Generator[dt_member.Member, None, None]':
+        """
+        :param status: The :class:`.Status` to look for.
+        :return: A generator of the members with the specified status. Members that are not \
+            offline come in no particular order.
+        """
+        code = _STATUS_CODES[status]
+        statuses, ids = self._statuses, self._ids
+        if code != _OFFLINE:
+            unmade = self._status_unmade[code]
+            while unmade:
+                member_id = unmade.pop()
+                self._make(member_id, self._rows[member_id])
+
+            # copied, as statuses can change between yields
+            yield from list(self._status_members[code].values())
+            return
+
+        row = statuses.find(code)
+        while row != -1:
+            yield self[ids[row]]
+            row = statuses.find(code, row + 1)
+
+    def with_role(self, role_id: int) -> 'typing.Generator[dt_member.Member, None, None]':
+        """
+        :param role_id: The ID of the role to look for.
+        :return: A generator of the members with the specified role.
+        """
+        return self._from_mask(self._roles.get(role_id, b""))
+
+    def named(self, name: str) -> 'typing.Generator[dt_member.Member, None, None]':
+        """
+        :param name: The username or nickname to look for, in any case.
+        :return: A generator of the members whose username or nickname case-insensitively \
+            matches, each only once.
+        """
+        usernames, nicknames = self._name_indexes()
+        folded = name.casefold()
+        seen = set()
+
+        for member_id in usernames.get(name) + nicknames.get(name):
+            row = self._rows.get(member_id)
+            if row is None or member_id in seen:
+                continue
+
+            username, nick = self._names(member_id, row)
+            if (username and username.casefold() == folded) \
+                    or (nick and nick.casefold() == folded):
+                seen.add(member_id)
+                yield self[member_id]
+
+    def starting_with(self, prefix: str) -> 'typing.Generator[dt_member.Member, None, None]':
+        """
+        :param prefix: The start of a username or nickname, in any case.
+        :return: A generator of the members whose username or nickname case-insensitively \
+            starts with the prefix, in name order, each only once.
+        """
+        usernames, nicknames = self._name_indexes()
+        folded = prefix.casefold()
+        seen = set()
+
+        for index in (usernames, nicknames):
+            for member_id in index.starting_with(prefix):
+                row = self._rows.get(member_id)
+                if row is None or member_id in seen:
+                    continue
+
+                username, nick = self._names(member_id, row)
+                if (username and username.casefold().startswith(folded)) \
+                        or (nick and nick.casefold().startswith(folded)):
+                    seen.add(member_id)
+                    yield self[member_id]
+
+    def joined_since(self, when: datetime.datetime) \
+            -> 'typing.Generator[dt_member.Member, None, None]':
+        """
+        :param when: The cutoff time. Naive datetimes are assumed to be in UTC.
+        :return: A generator of the members that joined at or after the specified time.
+        """
+        cutoff = self._timestamp(when)
+        joined, ids = self._joined, self._ids
+
+        for row, timestamp in enumerate(joined):
+            member_id = ids[row]
+            if not member_id:
+                continue
+
+            # NaN, so parse the join time from the member or the raw data
+            if timestamp != timestamp:
+                member = self._made.get(member_id)
+                joined_at = self._joined_raw[row] if member is None else member._joined_at
+                if isinstance(joined_at, str):
+                    joined_at = to_datetime(joined_at)
+
+                timestamp = joined[row] = \
+                    -math.inf if joined_at is None else self._timestamp(joined_at)
+
+            if timestamp >= cutoff:
+                yield self[member_id]
+
+    @staticmethod
+    def _timestamp(when: datetime.datetime) -> float:
+        if when.tzinfo is not None:
+            when = when.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+
+        return (when - _EPOCH).total_seconds()
+
+
 class Guild(Dataclass):
     """
     Represents a guild object on Discord.
@@ -629,7 +1275,7 @@ class Guild(Dataclass):
         "shard_id", "_roles", "_members", "_channels", "_emojis", "member_count", "_voice_states",
         "_large", "_chunks_left", "_finished_chunking", "icon_hash", "splash_hash",
         "owner_id", "afk_channel_id", "system_channel_id", "widget_channel_id",
-        "voice_client",
+        "voice_client", "_role_version", "_channel_version", "_role_index", "_channel_index",
         "channels", "roles", "emojis", "bans",
     )
 
@@ -668,6 +1314,17 @@ class Guild(Dataclass):
         #: The owner ID of this guild.
         self.owner_id = None  # type: int
 
+        # bumped whenever the roles or owner of this guild change, so that members know to
+        # recalculate their sorted roles, colour and permissions
+        self._role_version = 0
+
+        # bumped whenever a channel is created, updated or deleted
+        self._channel_version = 0
+
+        # (version, name index) for the roles and channels, remade when the version changes
+        self._role_index = None  # type: typing.Tuple[int, _NameIndex]
+        self._channel_index = None  # type: typing.Tuple[int, _NameIndex]
+
         #: The AFK timeout for this guild. None if there's no AFK timeout.
         self.afk_timeout = None  # type: int
 
@@ -692,7 +1349,7 @@ class Guild(Dataclass):
         #: The roles that this guild has.
         self._roles = {}
         #: The members of this guild.
-        self._members = {}
+        self._members = MemberStore(self.id)
         #: The channels of this guild.
         self._channels = {}
         #: The emojis that this guild has.
@@ -724,7 +1381,38 @@ class Guild(Dataclass):
         self.bans = GuildBanContainer(self)
 
     def _copy(self) -> 'Guild':
-        return copy.copy(self)
+        obb = object.__new__(self.__class__)
+
+        # shallow, like copy.copy, but without going through the dataclass __new__ guard
+        for slot in self.__slots__:
+            try:
+                setattr(obb, slot, getattr(self, slot))
+            except AttributeError:
+                pass
+
+        return obb
+
+    def _role_names(self) -> _NameIndex:
+        index = self._role_index
+        if index is None or index[0] != self._role_version:
+            names = _NameIndex()
+            for role in self._roles.values():
+                names.add(role.name, role.id)
+
+            index = self._role_index = (self._role_version, names)
+
+        return index[1]
+
+    def _channel_names(self) -> _NameIndex:
+        index = self._channel_index
+        if index is None or index[0] != self._channel_version:
+            names = _NameIndex()
+            for channel in self._channels.values():
+                names.add(channel.name, channel.id)
+
+            index = self._channel_index = (self._channel_version, names)
+
+        return index[1]
 
     def __repr__(self) -> str:
         return "<Guild id='{}' name='{}' members='{}'>".format(self.id, self.name,
@@ -806,7 +1494,7 @@ class Guild(Dataclass):
         """
         :return: The number of members with a non-Invisible presence. 
         """
-        return sum(1 for member in self._members.values() if member.status is not Status.OFFLINE)
+        return len(self._members) - self._members.count_status(Status.OFFLINE)
 
     # Presence methods
     def members_with_status(self, status: Status) \
@@ -814,9 +1502,7 @@ class Guild(Dataclass):
         """
         A generator that returns the members that match the specified status.
         """
-        for member in self.members.values():
-            if member.status == status:
-                yield member
+        yield from self._members.with_status(status)
 
     @property
     def online_members(self) -> 'typing.Generator[dt_member.Member, None, None]':
@@ -846,6 +1532,222 @@ class Guild(Dataclass):
         """
         return self.members_with_status(Status.OFFLINE)
 
+    # Bulk member queries
+    def members_with_role(self, role: 'dt_role.Role') \
+            -> 'typing.Generator[dt_member.Member, None, None]':
+        """
+        A generator that returns the members that have the specified role.
+
+        :param role: The :class:`.Role` (or role ID) to look for.
+        """
+        role_id = getattr(role, "id", role)
+        if role_id == self.id:
+            # everyone has the default role
+            yield from self._members.values()
+            return
+
+        yield from self._members.with_role(role_id)
+
+    def members_joined_since(self, when: datetime.datetime) \
+            -> 'typing.Generator[dt_member.Member, None, None]':
+        """
+        A generator that returns the members that joined this guild at or after the specified
+        time.
+
+        :param when: The cutoff time. Naive datetimes are assumed to be in UTC.
+        """
+        yield from self._members.joined_since(when)
+
+    def members_lacking_permission(self,
+                                   permission: 'typing.Union[str, dt_permissions.Permissions]') \
+            -> 'typing.Generator[dt_member.Member, None, None]':
+        """
+        A generator that returns the members that do not have the specified guild-wide
+        permissions. Channel overwrites are not taken into account.
+
+        :param permission: The name of the permission (e.g. ``"ban_members"``), or a \
+            :class:`.Permissions` with every required permission set.
+        """
+        if isinstance(permission, str):
+            permission = dt_permissions.Permissions(**{permission: True})
+
+        required = permission.bitfield
+        administrator = dt_permissions.Permissions(administrator=True).bitfield
+        store = self._members
+        everyone = store._live_mask()
+
+        # the rows of members that have every required bit, from their roles
+        has_all = everyone
+        for bit in range(required.bit_length()):
+            flag = 1 << bit
+            if not required & flag:
+                continue
+
+            holders = 0
+            for role in self._roles.values():
+                if not role.permissions.bitfield & (flag | administrator):
+                    continue
+
+                if role.id == self.id:
+                    holders = everyone
+                    break
+
+                holders |= store._role_mask(role.id)
+
+            has_all &= holders
+
+        for member in store._from_mask(everyone & ~has_all):
+            # the owner always has every permission
+            if member.id != self.owner_id:
+                yield member
+
+    def members_from_bitset(self, bitset: int) \
+            -> 'typing.Generator[dt_member.Member, None, None]':
+        """
+        A generator that returns the members in a bitset of member rows.
+
+        :param bitset: The bitset, from :meth:`.Guild.permission_bitsets`.
+        """
+        yield from self._members._from_mask(bitset)
+
+    def permission_bitsets(self, permission: 'typing.Union[str, dt_permissions.Permissions]',
+                           channels: 'typing.Iterable[dt_channel.Channel]' = None) \
+            -> 'typing.Dict[int, int]':
+        """
+        Works out which members have the specified permissions in each channel, for every member
+        at once. This applies the same overwrites as :meth:`.Channel.effective_permissions`.
+
+        The results are bitsets over the member rows of this guild; use
+        :meth:`.Guild.members_from_bitset` to get the members back out of one.
+
+        .. code-block:: python3
+
+            bitsets = guild.permission_bitsets("read_messages", [staff_channel])
+            can_read = list(guild.members_from_bitset(bitsets[staff_channel.id]))
+
+        :param permission: The name of the permission (e.g. ``"read_messages"``), or a \
+            :class:`.Permissions` with every required permission set.
+        :param channels: The channels to check. Defaults to every channel in this guild.
+        :return: A mapping of channel ID -> bitset of the members with every permission there.
+        """
+        if isinstance(permission, str):
+            permission = dt_permissions.Permissions(**{permission: True})
+
+        if channels is None:
+            channels = self._channels.values()
+
+        required = permission.bitfield
+        administrator = dt_permissions.Permissions(administrator=True).bitfield
+        store = self._members
+        everyone = store._live_mask()
+
+        # the rows of each role, and of the members that skip every overwrite
+        role_masks = {}
+        bypass = 0
+        for role in self._roles.values():
+            mask = everyone if role.id == self.id else store._role_mask(role.id)
+            role_masks[role.id] = mask
+            if role.permissions.bitfield & administrator:
+                bypass |= mask
+
+        owner_row = store._rows.get(self.owner_id)
+        if owner_row is not None:
+            bypass |= 1 << owner_row
+
+        # the rows that have each required bit from their roles, before any overwrites
+        bits = [1 << bit for bit in range(required.bit_length()) if required & (1 << bit)]
+        base = {}
+        for flag in bits:
+            holders = 0
+            for role in self._roles.values():
+                if role.permissions.bitfield & flag:
+                    holders |= role_masks[role.id]
+
+            base[flag] = holders
+
+        results = {}
+        for channel in channels:
+            # split the overwrites up by type, as masks of rows
+            everyone_overwrite = None
+            role_overwrites = []
+            member_overwrites = []
+            for target_id, overwrite in channel._overwrites.items():
+                if target_id == self.id:
+                    everyone_overwrite = overwrite
+                elif target_id in role_masks:
+                    role_overwrites.append((role_masks[target_id], overwrite))
+                else:
+                    row = store._rows.get(target_id)
+                    if row is not None:
+                        member_overwrites.append((1 << row, overwrite))
+
+            has_all = everyone
+            for flag in bits:
+                rows = base[flag]
+
+                if everyone_overwrite is not None:
+                    if everyone_overwrite.deny.bitfield & flag:
+                        rows = 0
+                    if everyone_overwrite.allow.bitfield & flag:
+                        rows = everyone
+
+                allowed = denied = 0
+                for mask, overwrite in role_overwrites:
+                    if overwrite.allow.bitfield & flag:
+                        allowed |= mask
+                    if overwrite.deny.bitfield & flag:
+                        denied |= mask
+
+                rows = (rows & ~denied) | allowed
+
+                for mask, overwrite in member_overwrites:
+                    if overwrite.deny.bitfield & flag:
+                        rows &= ~mask
+                    if overwrite.allow.bitfield & flag:
+                        rows |= mask
+
+                has_all &= rows
+
+            results[channel.id] = (has_all | bypass) & everyone
+
+        return results
+
+    def channels_allowing_role(self, role: 'dt_role.Role',
+                               permission: 'typing.Union[str, dt_permissions.Permissions]') \
+            -> 'typing.Generator[dt_channel.Channel, None, None]':
+        """
+        A generator that returns the channels where the specified role has the specified
+        permissions, from the role itself, ``@everyone`` and the overwrites for both.
+        Other roles that members may have are not taken into account.
+
+        :param role: The :class:`.Role` to check.
+        :param permission: The name of the permission (e.g. ``"send_messages"``), or a \
+            :class:`.Permissions` with every required permission set.
+        """
+        if isinstance(permission, str):
+            permission = dt_permissions.Permissions(**{permission: True})
+
+        required = permission.bitfield
+        administrator = dt_permissions.Permissions(administrator=True).bitfield
+        base = role.permissions.bitfield
+        default_role = self.default_role
+        if default_role is not None:
+            base |= default_role.permissions.bitfield
+
+        for channel in self._channels.values():
+            bits = base
+            if bits & administrator:
+                yield channel
+                continue
+
+            for target_id in (self.id, role.id):
+                overwrite = channel._overwrites.get(target_id)
+                if overwrite is not None:
+                    bits = (bits & ~overwrite.deny.bitfield) | overwrite.allow.bitfield
+
+            if bits & required == required:
+                yield channel
+
     @property
     def search(self) -> 'dt_search.SearchQuery':
         """
@@ -866,7 +1768,7 @@ class Guild(Dataclass):
         return self.embed_url + "?style={}".format(style)
 
     def search_for_member(self, *, name: str = None, discriminator: str = None,
-                          full_name: str = None):
+                          full_name: str = None, case_sensitive: bool = True):
         """
         Searches for a member.
 
@@ -874,6 +1776,8 @@ class Guild(Dataclass):
         :param discriminator: The discriminator of the member.
         :param full_name: The full name (i.e. username#discrim) of the member. Optional; will be \
             split up into the correct parameters.
+        :param case_sensitive: If False, and no member's name matches exactly, a member whose \
+            name matches in a different case is returned instead.
 
         .. warning::
 
@@ -885,25 +1789,59 @@ class Guild(Dataclass):
         if full_name is not None:
             if "#" in full_name:
                 sp = full_name.split("#", 1)
-                return self.search_for_member(name=sp[0], discriminator=sp[1])
+                return self.search_for_member(name=sp[0], discriminator=sp[1],
+                                              case_sensitive=case_sensitive)
             else:
                 # usually a mistake
-                return self.search_for_member(name=full_name)
+                return self.search_for_member(name=full_name, case_sensitive=case_sensitive)
 
         # coerce into a proper string
         if isinstance(discriminator, int):
             discriminator = "{:04d}".format(discriminator)
 
-        for member in self._members.values():
+        if name is None:
+            # a nickname of None matches members without one, so this has to check everyone
+            candidates = self._members.values()
+        else:
+            candidates = self._members.named(name)
+
+        matches = []
+        fallback = None
+        for member in candidates:
             # ensure discrim matches first
             if discriminator is not None and discriminator != member.user.discriminator:
                 continue
 
-            if member.user.username == name:
-                return member
+            if member.user.username == name or member.nickname == name:
+                if name is None:
+                    return member
+
+                matches.append(member)
+            elif fallback is None:
+                fallback = member
+
+        if len(matches) > 1:
+            # the index isn't in guild order, so find which match comes first in the guild
+            match_ids = {member.id for member in matches}
+            return self._members[next(i for i in self._members if i in match_ids)]
+
+        if matches:
+            return matches[0]
+
+        if not case_sensitive:
+            return fallback
+
+        return None
 
-            if member.nickname == name:
-                return member
+    def members_starting_with(self, prefix: str) \
+            -> 'typing.Generator[dt_member.Member, None, None]':
+        """
+        A generator that returns the members whose username or nickname starts with the
+        specified prefix, ignoring case. Useful for autocompletion.
+
+        :param prefix: The prefix to look for.
+        """
+        yield from self._members.starting_with(prefix)
 
     @deprecated(since="0.7.0", see_instead=search_for_member, removal="0.9.0")
     def find_member(self, search_str: str) -> 'dt_member.Member':
@@ -927,7 +1865,7 @@ class Guild(Dataclass):
             predicate = lambda member: member.user.name == sp[0] \
                                        and member.user.discriminator == sp[1]
 
-        filtered = filter(predicate, self.members.values())
+        filtered = filter(predicate, self._members.named(sp[0]))
         return next(filtered, None)
 
     # creation methods
@@ -939,6 +1877,7 @@ class Guild(Dataclass):
         """
         self._finished_chunking.clear()
         self._chunks_left = ceil(self.member_count / 1000)
+        current_bot.get().state._update_guild_status(self)
 
     async def wait_until_chunked(self) -> None:
         """
@@ -958,16 +1897,17 @@ class Guild(Dataclass):
             # We have a new chunk, so decrement the number left.
             self._chunks_left -= 1
 
+        state = current_bot.get().state
+        store = self._members
         for member_data in members:
             member_id = int(member_data["user"]["id"])
-            if member_id in self._members:
-                member_obj = self._members[member_id]
-            else:
-                member_obj = dt_member.Member(**member_data)
-                self._members[member_obj.id] = member_obj
-
-            member_obj.nickname = member_data.get("nick", member_obj.nickname)
-            member_obj.guild_id = self.id
+            if member_id in store:
+                if "nick" in member_data:
+                    store._set_nickname(member_id, member_data["nick"])
+            elif state._should_cache_member(member_id):
+                # members are only made when they're looked up
+                store._add_payload(member_data, state.make_user(member_data["user"]))
+                state._track_member(self.id, member_id)
 
     def _handle_emojis(self, emojis: typing.List[dict]):
         """
@@ -975,10 +1915,26 @@ class Guild(Dataclass):
         
         :param emojis: A list of emoji objects from Discord.
         """
+        state = current_bot.get().state
+        if not state.cache_policy.emojis:
+            return
+
+        index = state._emojis
+        new_emojis = {}
+
         for emoji in emojis:
             emoji_obj = dt_emoji.Emoji(**emoji)
-            self._emojis[emoji_obj.id] = emoji_obj
             emoji_obj.guild_id = self.id
+            new_emojis[emoji_obj.id] = emoji_obj
+
+        # this is the full list of emojis, so drop any that have been deleted
+        for emoji_id in set(self._emojis) - set(new_emojis):
+            del self._emojis[emoji_id]
+            index.pop(emoji_id, None)
+
+        # NB: update in place, as the emoji wrapper holds a reference to the dict
+        self._emojis.update(new_emojis)
+        index.update(new_emojis)
 
     def from_guild_create(self, **data: dict) -> 'Guild':
         """
@@ -1016,34 +1972,33 @@ class Guild(Dataclass):
 
         # Create all the Role objects for the server.
         for role_data in data.get("roles", []):
-            role_obj = dt_role.Role(**role_data)
+            role_obj = dt_role.Role._decode(role_data)
             role_obj.guild_id = self.id
             self._roles[role_obj.id] = role_obj
 
+        self._role_version += 1
+
         # Create all the Member objects for the server.
         self._handle_member_chunk(data.get("members", []))
 
-        for presence in data.get("presences", []):
-            member_id = int(presence["user"]["id"])
-            member_obj = self._members.get(member_id)
-
-            if not member_obj:
-                continue
-
-            member_obj.presence = Presence(**presence)
+        policy = current_bot.get().state.cache_policy
+        for presence in (data.get("presences", []) if policy.presences else []):
+            self._members.set_presence(int(presence["user"]["id"]), presence.get("status"),
+                                       presence.get("game"))
 
         # Create all of the channel objects.
         for channel_data in data.get("channels", []):
-            channel_obj = dt_channel.Channel(**channel_data)
+            channel_obj = dt_channel.Channel._decode(channel_data)
             self._channels[channel_obj.id] = channel_obj
             channel_obj.guild_id = self.id
             channel_obj._update_overwrites(channel_data.get("permission_overwrites", []), )
 
+        self._channel_version += 1
+
         # Create all of the voice states.
-        for vs_data in data.get("voice_states", []):
+        for vs_data in (data.get("voice_states", []) if policy.voice_states else []):
             user_id = int(vs_data.get("user_id", 0))
-            member = self.members.get(user_id)
-            if not member:
+            if user_id not in self._members:
                 # o well
                 continue
 
@@ -1211,6 +2166,170 @@ class Guild(Dataclass):
         """
         return await self.bans.remove(user)
 
+    async def _run_bulk(self, jobs: 'typing.Iterable[typing.Tuple[int, typing.Callable]]',
+                        concurrency: int = _BULK_CONCURRENCY) \
+            -> 'typing.Dict[int, typing.Union[None, Exception]]':
+        """
+        Runs a batch of moderation requests concurrently.
+
+        Up to ``concurrency`` requests are in flight at once; the HTTP client's ratelimit handling
+        does the throttling for each bucket.
+
+        :param jobs: An iterable of (target ID, coroutine function) tuples.
+        :param concurrency: The maximum number of requests to have in flight at once.
+        :return: A dict of target ID -> None if the request succeeded, or the exception raised.
+        """
+        jobs = iter(jobs)
+        results = {}
+
+        # every worker pulls from the same iterator, so each job is only run once
+        async def worker():
+            for target_id, cofunc in jobs:
+                try:
+                    await cofunc()
+                except Exception as e:
+                    results[target_id] = e
+                else:
+                    results[target_id] = None
+
+        async with multio.asynclib.task_manager() as tg:
+            for _ in range(concurrency):
+                await multio.asynclib.spawn(tg, worker)
+
+        return results
+
+    async def bulk_ban(self,
+                       victims: 'typing.Iterable[typing.Union[dt_member.Member, dt_user.User, '
+                                'int]]', *,
+                       delete_message_days: int = 0,
+                       reason: str = None) -> 'typing.Dict[int, typing.Union[None, Exception]]':
+        """
+        Bans many users from the guild at once.
+
+        Unlike :meth:`.GuildBanContainer.add`, a failure to ban one victim does not stop the
+        others from being banned; instead, every victim gets its own result.
+
+        .. code-block:: python3
+
+            results = await guild.bulk_ban(raiders, reason="Raid")
+            failed = [id for id, error in results.items() if error is not None]
+
+        Victims that are members of this guild, including ones given as a :class:`.User` or an ID,
+        are checked against the role hierarchy first.
+
+        :param victims: The :class:`.Member`, :class:`.User` objects or user IDs to ban.
+        :param delete_message_days: The number of days to delete messages.
+        :param reason: The reason given for banning.
+        :return: A dict of user ID -> None if the ban succeeded, or the exception raised.
+        """
+        if not self.me.guild_permissions.ban_members:
+            raise PermissionsError("ban_members")
+
+        bot = current_bot.get()
+        results = {}
+        jobs = []
+        top_role = self.me.top_role
+
+        for victim in victims:
+            if isinstance(victim, (dt_member.Member, dt_user.User)):
+                victim_id = victim.id
+            else:
+                victim_id = int(victim)
+
+            if victim_id == self.owner_id:
+                results[victim_id] = HierarchyError("Cannot ban the owner")
+                continue
+
+            # users and IDs of members still in the guild get the same hierarchy check
+            member = self._members.get(victim_id)
+            if member is not None and member.top_role >= top_role:
+                msg = "Top role is equal to or lower than victim's top role"
+                results[victim_id] = HierarchyError(msg)
+                continue
+
+            cofunc = functools.partial(bot.http.ban_user, self.id, victim_id,
+                                       delete_message_days=delete_message_days, reason=reason)
+            jobs.append((victim_id, cofunc))
+
+        results.update(await self._run_bulk(jobs))
+        return results
+
+    async def bulk_add_roles(self, members: 'typing.Iterable[dt_member.Member]',
+                             *roles: 'dt_role.Role') \
+            -> 'typing.Dict[int, typing.Union[None, Exception]]':
+        """
+        Adds roles to many members at once.
+
+        This does not wait for the member update to arrive over the gateway, unlike
+        :meth:`.MemberRoleContainer.add`.
+
+        :param members: The :class:`.Member` objects to add the roles to.
+        :param roles: The :class:`.Role` objects to add to each member.
+        :return: A dict of member ID -> None if the edit succeeded, or the exception raised.
+        """
+        if not self.me.guild_permissions.manage_roles:
+            raise PermissionsError("manage_roles")
+
+        top_role = self.me.top_role
+        for _r in roles:
+            if _r >= top_role:
+                msg = "Cannot add role {} - it has a higher or equal position to our top role" \
+                    .format(_r.name)
+                raise HierarchyError(msg)
+
+        bot = current_bot.get()
+        new_ids = {_r.id for _r in roles}
+        jobs = []
+
+        for member in members:
+            # skip members that already have every role
+            if new_ids.issubset(member.role_ids):
+                continue
+
+            role_ids = new_ids.union(member.role_ids)
+            cofunc = functools.partial(bot.http.edit_member_roles, self.id, member.id, role_ids)
+            jobs.append((member.id, cofunc))
+
+        return await self._run_bulk(jobs)
+
+    async def bulk_reset_nicknames(self, members: 'typing.Iterable[dt_member.Member]') \
+            -> 'typing.Dict[int, typing.Union[None, Exception]]':
+        """
+        Resets the nicknames of many members at once.
+
+        This does not wait for the member update to arrive over the gateway, unlike
+        :meth:`.Nickname.reset`.
+
+        :param members: The :class:`.Member` objects to reset the nicknames of.
+        :return: A dict of member ID -> None if the reset succeeded, or the exception raised.
+        """
+        if not self.me.guild_permissions.manage_nicknames:
+            raise PermissionsError("manage_nicknames")
+
+        bot = current_bot.get()
+        me = self.me
+        results = {}
+        jobs = []
+
+        for member in members:
+            if not member.nickname.value:
+                continue
+
+            if member == me:
+                cofunc = functools.partial(bot.http.change_nickname, self.id, None, me=True)
+            elif member.top_role >= me.top_role:
+                msg = "Top role is equal to or lower than victim's top role"
+                results[member.id] = HierarchyError(msg)
+                continue
+            else:
+                cofunc = functools.partial(bot.http.change_nickname, self.id, None,
+                                           member_id=member.id)
+
+            jobs.append((member.id, cofunc))
+
+        results.update(await self._run_bulk(jobs))
+        return results
+
     async def get_webhooks(self) -> 'typing.List[dt_webhook.Webhook]':
         """
         Gets the webhooks for this guild.
@@ -18,20 +18,62 @@ Wrappers for Member objects (Users with guilds).
 
 .. currentmodule:: curious.dataclasses.member
 """
+import array
 import datetime
-from typing import List
+import itertools
+from typing import Iterable, List, Union
 
 import collections
 
 from curious.core import current_bot
 from curious.dataclasses import guild as dt_guild, role as dt_role, user as dt_user, \
     voice_state as dt_vs
-from curious.dataclasses.bases import Dataclass
+from curious.dataclasses.bases import Dataclass, Field
 from curious.dataclasses.permissions import Permissions
 from curious.dataclasses.presence import Game, Presence, Status
 from curious.exc import HierarchyError, PermissionsError
 from curious.util import to_datetime
 
+# member versions, see Member._version
+_versions = itertools.count()
+
+
+class _FrozenPresence(Presence):
+    """
+    A :class:`.Presence` that can't be changed, so that it can be shared between members.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, **kwargs) -> None:
+        presence = Presence(**kwargs)
+        object.__setattr__(self, "_status", presence.status)
+        object.__setattr__(self, "_game", presence.game)
+
+    def __setattr__(self, key, value):
+        raise AttributeError("This presence is shared between members and can't be changed")
+
+
+#: The presence shared by every member that is offline and not playing anything.
+#: This can't be changed; a new :class:`.Presence` is made when the member comes online.
+_OFFLINE_PRESENCE = _FrozenPresence(status=Status.OFFLINE)
+
+
+def _make_presence(status: 'Union[str, Status]' = None, game: dict = None) -> Presence:
+    """
+    Makes the presence for a member, re-using the shared offline presence where possible.
+
+    :param status: The status of the member.
+    :param game: The game data for the member, if any.
+    :return: A :class:`.Presence` for the member.
+    """
+    # presence updates send an empty game, rather than none at all
+    game = game or None
+    if game is None and (status is None or status == Status.OFFLINE or status == "offline"):
+        return _OFFLINE_PRESENCE
+
+    return Presence(status=status or Status.OFFLINE, game=game)
+
 
 class Nickname(object):
     """
@@ -118,19 +160,9 @@ class MemberRoleContainer(collections.Sequence):
         self._member = member
 
     def _sorted_roles(self) -> 'List[dt_role.Role]':
-        if not self._member.guild:
-            return []
-
-        roles = filter(
-            lambda r: r is not None,
-            map(self._member.guild.roles.get, self._member.role_ids)
-        )
+        # cached on the member until the guild's roles or the member's roles change
+        return self._member._role_cache()[2]
 
-        return sorted(roles, reverse=True)
-
-    # opt: the default Sequence makes us re-create the sorted role list constantly
-    # we don't wanna cache it, without introducing invalidation hell
-    # so we just put `__iter__` on `_sorted_roles`
     def __iter__(self) -> type(iter([])):
         return iter(self._sorted_roles())
 
@@ -149,7 +181,7 @@ class MemberRoleContainer(collections.Sequence):
         if len(roles) <= 0:
             return self._member.guild.default_role
 
-        return self[0]
+        return roles[0]
 
     async def add(self, *roles: 'dt_role.Role'):
         """
@@ -223,35 +255,85 @@ class Member(Dataclass):
     A member represents somebody who is inside a guild.
     """
 
-    __slots__ = ("_user_data", "role_ids", "joined_at", "_nickname", "guild_id", "presence",
-                 "roles")
+    __slots__ = ("_user", "_role_ids", "_joined_at", "_nick", "guild_id", "presence", "_row",
+                 "_version", "_cache")
+
+    # keep in sync with __init__
+    _payload_fields = (
+        Field("id", convert=lambda data: int(data["user"]["id"])),
+        Field("_user", convert=lambda data: current_bot.get().state.make_user(data["user"])),
+        Field("_role_ids", "roles", (), convert=lambda value: array.array("Q", map(int, value))),
+        Field("_joined_at", "joined_at"),
+        Field("_nick", "nick"),
+        Field("guild_id"),
+        Field("presence", convert=lambda data: _make_presence(data.get("status"),
+                                                              data.get("game"))),
+        Field("_version", convert=lambda data: next(_versions)),
+        Field("_cache"),
+    )
 
     def __init__(self, **kwargs) -> None:
         super().__init__(kwargs["user"]["id"])
 
-        # copy user data for when the user is decached
-        self._user_data = kwargs["user"]
-        current_bot.get().state.make_user(self._user_data)
-
-        #: An iterable of role IDs this member has.
-        self.role_ids = [int(rid) for rid in kwargs.get("roles", [])]
+        # keep a reference to the user for when the user is decached
+        # this is shared with the user cache, rather than a copy of the raw user data
+        self._user = current_bot.get().state.make_user(kwargs["user"])  # type: dt_user.User
 
-        #: A :class:`._MemberRoleContainer` that represents the roles of this member.
-        self.roles = MemberRoleContainer(self)
+        #: An array of role IDs this member has.
+        self._role_ids = array.array("Q", map(int, kwargs.get("roles", ())))
 
-        #: The date the user joined the guild.
-        self.joined_at = to_datetime(kwargs.get("joined_at", None))  # type: datetime.datetime
+        # parsed lazily, as most members never have their join date looked at
+        self._joined_at = kwargs.get("joined_at", None)  # type: Union[str, datetime.datetime]
 
-        nick = kwargs.get("nick")
-        #: The member's current :class:`.Nickname`.
-        self._nickname = Nickname(self, nick)  # type: Nickname
+        # the raw nickname string, wrapped in a Nickname on access
+        self._nick = kwargs.get("nick")  # type: str
 
         #: The ID of the guild that this member is in.
         self.guild_id = None  # type: int
 
         #: The current :class:`.Presence` of this member.
-        self.presence = Presence(status=kwargs.get("status", Status.OFFLINE),
-                                 game=kwargs.get("game", None))
+        self.presence = _make_presence(kwargs.get("status"), kwargs.get("game"))
+
+        # changed whenever the roles of this member change
+        # these are unique across members, so a re-joined member never matches a cached entry
+        self._version = next(_versions)
+
+        # [guild role version, member version, sorted roles, colour, permission bitfield]
+        self._cache = None  # type: list
+
+    @property
+    def role_ids(self) -> 'array.array':
+        """
+        :return: An array of role IDs this member has.
+        """
+        return self._role_ids
+
+    @role_ids.setter
+    def role_ids(self, value: 'Iterable[int]'):
+        self._role_ids = array.array("Q", map(int, value))
+        self._version = next(_versions)
+
+    @property
+    def roles(self) -> 'MemberRoleContainer':
+        """
+        :return: A :class:`.MemberRoleContainer` that represents the roles of this member.
+        """
+        return MemberRoleContainer(self)
+
+    @property
+    def joined_at(self) -> datetime.datetime:
+        """
+        :return: The date the user joined the guild.
+        """
+        joined_at = self._joined_at
+        if isinstance(joined_at, str):
+            joined_at = self._joined_at = to_datetime(joined_at)
+
+        return joined_at
+
+    @joined_at.setter
+    def joined_at(self, value: 'Union[str, datetime.datetime]'):
+        self._joined_at = value
 
     @property
     def guild(self) -> 'dt_guild.Guild':
@@ -278,14 +360,14 @@ class Member(Dataclass):
         :getter: A :class:`._Nickname` for this member.
         :setter: Coerces a string nickname into a :class:`._Nickname`. Do not use.
         """
-        return self._nickname
+        return Nickname(self, self._nick)
 
     @nickname.setter
     def nickname(self, value: str):
         if isinstance(value, Nickname):
             # unwrap nicknames, in case of error
             value = value.value
-        self._nickname.value = value
+        self._nick = value
 
     def __hash__(self) -> int:
         return hash(self.guild_id) + hash(self.user.id)
@@ -303,20 +385,36 @@ class Member(Dataclass):
         new_object = object.__new__(self.__class__)  # type: Member
 
         new_object.id = self.id
-        new_object.role_ids = self.role_ids.copy()
-        new_object.joined_at = self.joined_at
+        new_object._user = self._user
+        new_object._role_ids = array.array("Q", self._role_ids)
+        new_object._joined_at = self._joined_at
         new_object.guild_id = self.guild_id
         new_object.presence = self.presence
-        new_object._nickname = self._nickname
+        new_object._nick = self._nick
+        new_object._version = self._version
+        new_object._cache = None
 
         return new_object
 
-    def __del__(self):
-        try:
-            current_bot.get().state._check_decache_user(self.id)
-        except (AttributeError, LookupError):
-            # during shutdown
-            pass
+    def _role_cache(self) -> list:
+        """
+        Gets the cached role data of this member, remaking it if the guild's roles or this
+        member's roles have changed since it was made.
+        """
+        guild = self.guild
+        role_version = guild._role_version if guild is not None else -1
+        cache = self._cache
+        if cache is None or cache[0] != role_version or cache[1] != self._version:
+            if guild is None:
+                roles = []
+            else:
+                roles = sorted(filter(lambda r: r is not None, map(guild._roles.get,
+                                                                    self._role_ids)),
+                               reverse=True)
+
+            cache = self._cache = [role_version, self._version, roles, None, None]
+
+        return cache
 
     @property
     def user(self) -> 'dt_user.User':
@@ -327,21 +425,22 @@ class Member(Dataclass):
             return current_bot.get().state._users[self.id]
         except KeyError:
             # don't go through make_user as it'll cache it
-            return dt_user.User(current_bot.get(), **self._user_data)
+            return self._user
 
     @property
     def name(self) -> str:
         """
         :return: The computed display name of this user.
         """
-        return self.nickname if self.nickname != None else self.user.username
+        nickname = self.nickname
+        return nickname if nickname != None else self.user.username
 
     @property
     def mention(self) -> str:
         """
         :return: A string that mentions this member. 
         """
-        if self.nickname:
+        if self._nick:
             return "<@!{}>".format(self.id)
 
         return self.user.mention
@@ -371,16 +470,23 @@ class Member(Dataclass):
         """
         :return: The computed colour of this user.
         """
-        roles = reversed(self.roles)
+        cache = self._role_cache()
+        if cache[3] is not None:
+            return cache[3]
+
+        roles = reversed(cache[2])
 
         # NB: you can abuse discord and edit the defualt role's colour
         # so explicitly check that it isn't the default role, and make sure it has a colour
         # in order to get the correct calculated colour
         roles = filter(lambda role: not role.is_default_role and role.colour, roles)
         try:
-            return next(roles).colour
+            colour = next(roles).colour
         except StopIteration:
-            return 0
+            colour = 0
+
+        cache[3] = colour
+        return colour
 
     @property
     def top_role(self) -> 'dt_role.Role':
@@ -394,19 +500,25 @@ class Member(Dataclass):
         """
         :return: The calculated guild permissions for a member.
         """
-        if self == self.guild.owner:
-            return Permissions.all()
+        cache = self._role_cache()
+        if cache[4] is not None:
+            # the permissions object is mutable, so hand out a new one each time
+            return Permissions(cache[4])
 
-        bitfield = 0
-        # add the default roles
-        bitfield |= self.guild.default_role.permissions.bitfield
-        for role in self.roles:
-            bitfield |= role.permissions.bitfield
+        if self == self.guild.owner:
+            permissions = Permissions.all()
+        else:
+            bitfield = 0
+            # add the default roles
+            bitfield |= self.guild.default_role.permissions.bitfield
+            for role in cache[2]:
+                bitfield |= role.permissions.bitfield
 
-        permissions = Permissions(bitfield)
-        if permissions.administrator:
-            return Permissions.all()
+            permissions = Permissions(bitfield)
+            if permissions.administrator:
+                permissions = Permissions.all()
 
+        cache[4] = permissions.bitfield
         return permissions
 
     # Member methods.
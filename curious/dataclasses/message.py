@@ -18,6 +18,7 @@ Wrappers for Message objects.
 
 .. currentmodule:: curious.dataclasses.message
 """
+import datetime
 import enum
 import re
 import typing
@@ -27,8 +28,9 @@ from curious.dataclasses import channel as dt_channel, emoji as dt_emoji, guild
     invite as dt_invite, member as dt_member, role as dt_role, user as dt_user, \
     webhook as dt_webhook
 from curious.dataclasses.attachment import Attachment
-from curious.dataclasses.bases import Dataclass
+from curious.dataclasses.bases import Dataclass, Field, snowflake
 from curious.dataclasses.embed import Embed
+from curious.dataclasses.reaction import Reaction
 from curious.exc import CuriousError, ErrorCode, HTTPException, PermissionsError
 from curious.util import AsyncIteratorWrapper, to_datetime
 
@@ -37,6 +39,16 @@ INVITE_REGEX = re.compile(r"(?:discord\.gg/(\S+)|discordapp\.com/invites/(\S+))"
 EMOJI_REGEX = re.compile(r"<a?:([\S]+):([0-9]+)>")
 MENTION_REGEX = re.compile(r"<@!?([0-9]+)>")
 
+# the parts of a message payload that are only decoded when they are accessed
+_LAZY_KEYS = ("embeds", "attachments", "reactions", "mentions", "mention_roles")
+
+
+def _lazy_data(data: dict) -> dict:
+    """
+    Picks the parts of a message payload that are decoded lazily, skipping empty ones.
+    """
+    return {key: data[key] for key in _LAZY_KEYS if data.get(key)}
+
 
 class MessageType(enum.IntEnum):
     """
@@ -72,9 +84,25 @@ class Message(Dataclass):
     """
     Represents a Message.
     """
-    __slots__ = ("content", "guild_id", "author", "created_at", "edited_at", "embeds",
-                 "attachments", "_mentions", "_role_mentions", "reactions", "channel_id",
-                 "author_id", "type")
+    __slots__ = ("content", "guild_id", "author", "_created_at", "_edited_at", "_embeds",
+                 "_attachments", "_reactions", "_data", "channel_id", "author_id", "type")
+
+    # keep in sync with __init__
+    _payload_fields = (
+        Field("id", "id", convert=snowflake),
+        Field("content", "content"),
+        Field("guild_id"),
+        Field("channel_id", "channel_id", 0, convert=int),
+        Field("author_id", "author", {}, convert=lambda value: int(value.get("id", 0)) or None),
+        Field("author"),
+        Field("type", "type", 0, convert=lambda value: MessageType(value)),
+        Field("_created_at", "timestamp"),
+        Field("_edited_at", "edited_timestamp"),
+        Field("_embeds"),
+        Field("_attachments"),
+        Field("_reactions"),
+        Field("_data", convert=_lazy_data),
+    )
 
     def __init__(self, **kwargs):
         super().__init__(kwargs.get("id"))
@@ -99,42 +127,114 @@ class Message(Dataclass):
         #: The type of this message.
         self.type = MessageType(type_)
 
-        #: The true timestamp of this message, a :class:`datetime.datetime`.
-        #: This is not the snowflake timestamp.
-        self.created_at = to_datetime(kwargs.get("timestamp", None))
+        # the raw timestamps, parsed on first access
+        self._created_at = kwargs.get("timestamp", None)
+        self._edited_at = kwargs.get("edited_timestamp", None)
 
-        #: The edited timestamp of this message.
-        #: This can sometimes be None.
-        edited_timestamp = kwargs.get("edited_timestamp", None)
-        if edited_timestamp is not None:
-            self.edited_at = to_datetime(edited_timestamp)
-        else:
-            self.edited_at = None
+        # embeds, attachments and reactions are made from the raw payload on first access
+        self._embeds = None  # type: typing.List[Embed]
+        self._attachments = None  # type: typing.List[Attachment]
+        self._reactions = None  # type: typing.List[Reaction]
 
-        #: The list of :class:`.Embed` objects this message contains.
-        self.embeds = []
-        for embed in kwargs.get("embeds", []):
-            self.embeds.append(Embed(**embed))
+        # the parts of the raw payload that haven't been decoded yet
+        self._data = _lazy_data(kwargs)  # type: dict
 
-        #: The list of :class:`.Attachment` this message contains.
-        self.attachments = []
+    def __repr__(self) -> str:
+        return "<{0.__class__.__name__} id={0.id} content='{0.content}'>".format(self)
+
+    @property
+    def embeds(self) -> 'typing.List[Embed]':
+        """
+        :return: The list of :class:`.Embed` objects this message contains.
+        """
+        embeds = self._embeds
+        if embeds is None:
+            embeds = self._embeds = [Embed(**embed) for embed in self._data.pop("embeds", [])]
 
-        for attachment in kwargs.get("attachments", []):
-            self.attachments.append(Attachment(**attachment))
+        return embeds
 
-        #: The mentions for this message.
-        #: This is UNORDERED.
-        self._mentions = kwargs.get("mentions", [])
+    @property
+    def attachments(self) -> 'typing.List[Attachment]':
+        """
+        :return: The list of :class:`.Attachment` this message contains.
+        """
+        attachments = self._attachments
+        if attachments is None:
+            attachments = self._attachments = [Attachment(**attachment)
+                                               for attachment in self._data.pop("attachments", [])]
 
-        #: The role mentions for this message.
-        #: This is UNORDERED.
-        self._role_mentions = kwargs.get("mention_roles", [])
+        return attachments
 
-        #: The reactions for this message.
-        self.reactions = []
+    @property
+    def reactions(self) -> 'typing.List[Reaction]':
+        """
+        :return: The list of :class:`.Reaction` on this message.
+        """
+        reactions = self._reactions
+        if reactions is None:
+            reactions = self._reactions = self._make_reactions()
 
-    def __repr__(self) -> str:
-        return "<{0.__class__.__name__} id={0.id} content='{0.content}'>".format(self)
+        return reactions
+
+    @reactions.setter
+    def reactions(self, value: 'typing.List[Reaction]'):
+        self._data.pop("reactions", None)
+        self._reactions = value
+
+    def _make_reactions(self) -> 'typing.List[Reaction]':
+        """
+        Makes the reactions for this message from the raw payload.
+        """
+        state = current_bot.get().state
+        reactions = []
+        for reaction_data in self._data.pop("reactions", []):
+            emoji = reaction_data.get("emoji", {})
+            reaction = Reaction(**reaction_data)
+            reaction.message = self
+
+            if "id" in emoji and emoji["id"] is not None:
+                emoji_obb = state.find_emoji(int(emoji["id"]))
+                if emoji_obb is None:
+                    emoji_obb = dt_emoji.Emoji(id=emoji["id"], name=emoji["name"])
+            else:
+                emoji_obb = emoji.get("name", None)
+
+            reaction.emoji = emoji_obb
+            reactions.append(reaction)
+
+        return reactions
+
+    @property
+    def created_at(self) -> datetime.datetime:
+        """
+        :return: The true timestamp of this message, a :class:`datetime.datetime`. This is not \
+            the snowflake timestamp.
+        """
+        created_at = self._created_at
+        if isinstance(created_at, str):
+            created_at = self._created_at = to_datetime(created_at)
+
+        return created_at
+
+    @created_at.setter
+    def created_at(self, value: 'typing.Union[str, datetime.datetime]'):
+        self._created_at = value
+
+    @property
+    def edited_at(self) -> 'typing.Optional[datetime.datetime]':
+        """
+        :return: The edited timestamp of this message, a :class:`datetime.datetime`. This can \
+            sometimes be None.
+        """
+        edited_at = self._edited_at
+        if isinstance(edited_at, str):
+            edited_at = self._edited_at = to_datetime(edited_at)
+
+        return edited_at
+
+    @edited_at.setter
+    def edited_at(self, value: 'typing.Union[str, datetime.datetime]'):
+        self._edited_at = value
 
     def __str__(self) -> str:
         return self.content
@@ -164,7 +264,7 @@ class Message(Dataclass):
             particular order.
 
         """
-        return self._resolve_mentions(self._mentions, "member")
+        return self._resolve_mentions(self._data.get("mentions", []), "member")
 
     @property
     def role_mentions(self) -> 'typing.List[dt_role.Role]':
@@ -178,7 +278,7 @@ class Message(Dataclass):
 
         """
 
-        return self._resolve_mentions(self._role_mentions, "role")
+        return self._resolve_mentions(self._data.get("mention_roles", []), "role")
 
     @property
     def channel_mentions(self) -> 'typing.List[dt_channel.Channel]':
@@ -201,9 +301,11 @@ class Message(Dataclass):
         matches = EMOJI_REGEX.findall(self.content)
         emojis = []
 
+        # the emoji index covers every guild, so only keep the emojis from this one
+        find_emoji = current_bot.get().state.find_emoji
         for (name, i) in matches:
-            e = self.guild.emojis.get(int(i))
-            if e:
+            e = find_emoji(int(i))
+            if e is not None and e.guild_id == self.guild_id:
                 emojis.append(e)
 
         return emojis
@@ -186,6 +186,32 @@ def build_permissions_class(name: str = "Permissions") -> type:
 Permissions = build_permissions_class("Permissions")
 
 
+def can(member: 'dt_member.Member', channel: 'dt_channel.Channel',
+        permissions: typing.Union[str, int, Permissions]) -> bool:
+    """
+    Checks if a member has all of the specified permissions in a channel, taking every overwrite
+    into account.
+
+    .. code-block:: python3
+
+        if can(member, channel, Permissions(send_messages=True, embed_links=True)):
+            ...
+
+    :param member: The :class:`.Member` to check.
+    :param channel: The :class:`.Channel` to check in.
+    :param permissions: The name of the permission (e.g. ``"send_messages"``), a \
+        :class:`.Permissions`, or a permission bitfield, to check for.
+    :return: True if the member has every one of the permissions, False otherwise.
+    """
+    if isinstance(permissions, str):
+        permissions = Permissions(**{permissions: True})
+
+    if isinstance(permissions, Permissions):
+        permissions = permissions.bitfield
+
+    return channel._permission_bits(member) & permissions == permissions
+
+
 class Overwrite(object):
     """
     Represents a permission overwrite.
@@ -244,8 +270,16 @@ class Overwrite(object):
         Attribute getter helper.
 
         This will check allow first, the deny, then finally the role permissions.
+        For members, this uses the permissions resolved from every overwrite in the channel.
         """
         if isinstance(self.target, dt_member.Member):
+            channel = self.channel
+            if channel is not None and channel.guild_id is not None:
+                if not hasattr(Permissions, item):
+                    raise AttributeError(item)
+
+                return getattr(Permissions(channel._permission_bits(self.target)), item)
+
             permissions = self.target.guild_permissions
         elif isinstance(self.target, dt_role.Role):
             permissions = self.target.permissions
@@ -24,7 +24,7 @@ import functools
 from curious.core import current_bot
 from curious.dataclasses import guild as dt_guild, member as dt_member, \
     permissions as dt_permissions
-from curious.dataclasses.bases import Dataclass
+from curious.dataclasses.bases import Dataclass, Field, snowflake
 from curious.exc import PermissionsError
 
 
@@ -64,6 +64,20 @@ class Role(Dataclass):
     __slots__ = "name", "colour", "hoisted", "mentionable", "permissions", "managed", "position", \
                 "guild_id"
 
+    # keep in sync with __init__
+    _payload_fields = (
+        Field("id", "id", convert=snowflake),
+        Field("name", "name"),
+        Field("colour", "color", 0),
+        Field("hoisted", "hoist", False),
+        Field("mentionable", "mentionable", False),
+        Field("permissions", "permissions", 0,
+              convert=lambda value: dt_permissions.Permissions(value)),
+        Field("managed", "managed", False),
+        Field("position", "position", 0),
+        Field("guild_id", "guild_id", 0, convert=int),
+    )
+
     def __init__(self, **kwargs) -> None:
         super().__init__(kwargs.get("id"))
 
@@ -23,7 +23,7 @@ import datetime
 
 from curious.core import current_bot
 from curious.dataclasses import channel as dt_channel, guild as dt_guild, message as dt_message
-from curious.dataclasses.bases import Dataclass
+from curious.dataclasses.bases import Dataclass, Field, snowflake
 from curious.exc import CuriousError
 
 
@@ -103,6 +103,17 @@ class User(Dataclass):
     __slots__ = ("username", "discriminator", "avatar_hash", "verified", "mfa_enabled",
                  "bot", "_bot")
 
+    # keep in sync with __init__
+    _payload_fields = (
+        Field("id", "id", convert=snowflake),
+        Field("username", "username"),
+        Field("discriminator", "discriminator"),
+        Field("avatar_hash", "avatar"),
+        Field("verified", "verified"),
+        Field("mfa_enabled", "mfa_enabled"),
+        Field("bot", "bot", False),
+    )
+
     def __init__(self, **kwargs):
         super().__init__(kwargs.get("id"))
 
@@ -193,11 +204,11 @@ class User(Dataclass):
         if self.discriminator == "0000":
             raise CuriousError("Cannot open a private channel with a webhook")
 
-        # First, try and access the channel from the channel cache.
+        # First, try and find an existing DM with this user in the channel cache.
         bot = current_bot.get()
-        original_channel = bot.state.find_channel(self.id)
-        if original_channel:
-            return original_channel
+        for channel in bot.state._private_channels.values():
+            if channel.type == dt_channel.ChannelType.PRIVATE and self.id in channel._recipients:
+                return channel
 
         # Failing that, open a new private channel.
         channel_data = await bot.http.create_private_channel(self.id)
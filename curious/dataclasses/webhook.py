@@ -18,15 +18,20 @@ Wrappers for Webhook objects.
 
 .. currentmodule:: curious.dataclasses.webhook
 """
-
+import logging
 import typing
 
+import collections
+import multio
+
 from curious.core import current_bot
 from curious.dataclasses import channel as dt_channel, embed as dt_embed, guild as dt_guild, \
     user as dt_user
 from curious.dataclasses.bases import Dataclass
 from curious.util import base64ify
 
+logger = logging.getLogger("curious.webhook")
+
 
 class Webhook(Dataclass):
     """
@@ -212,3 +217,215 @@ class Webhook(Dataclass):
 
         if wait:
             return bot.state.make_message(data, cache=False)
+
+
+class WebhookSender(object):
+    """
+    Sends messages through a :class:`.Webhook` in batches.
+
+    Queued text is joined into messages of up to 2000 characters, and queued embeds are sent up
+    to 10 at a time, every ``flush_interval`` seconds. Only one request is made at a time, so
+    the sender stays inside the webhook's ratelimit bucket.
+
+    .. code-block:: python3
+
+        sender = WebhookSender(webhook, flush_interval=2)
+        await client.events.spawn(sender.run)
+
+        sender.send("Something happened")
+        sender.send(embed=Embed(title="Something else happened"))
+    """
+
+    #: The maximum number of characters in a message.
+    MAX_CONTENT = 2000
+
+    #: The maximum number of embeds in a message.
+    MAX_EMBEDS = 10
+
+    #: The number of times a batch is retried before it is dropped.
+    MAX_RETRIES = 5
+
+    #: The longest time, in seconds, to back off for after failed sends.
+    MAX_BACKOFF = 60
+
+    def __init__(self, webhook: Webhook, *,
+                 flush_interval: float = 1.0, max_queued: int = 1000,
+                 username: str = None, avatar_url: str = None):
+        """
+        :param webhook: The :class:`.Webhook` to send messages through.
+        :param flush_interval: The number of seconds to wait between sending batches.
+        :param max_queued: The maximum number of items to queue before dropping new ones.
+        :param username: A username to override the default username of the webhook with.
+        :param avatar_url: The URL for the avatar to override the default avatar with.
+        """
+        self.webhook = webhook
+        self.flush_interval = flush_interval
+        self.max_queued = max_queued
+        self.username = username
+        self.avatar_url = avatar_url
+
+        #: The number of items that have been dropped because the queue was full, the number
+        #: of batches dropped after failing to send :attr:`MAX_RETRIES` times, and the number of
+        #: items that couldn't be sent when the sender was stopped.
+        self.dropped = 0
+
+        #: The number of messages that have been sent.
+        self.sent = 0
+
+        # (content, embed dict) items, one of which is None
+        self._queue = collections.deque()
+        self._lock = multio.Lock()
+        self._running = False
+
+        # the number of times in a row the batch at the front of the queue failed to send
+        self._failures = 0
+
+    @property
+    def queued(self) -> int:
+        """
+        :return: The number of items waiting to be sent.
+        """
+        return len(self._queue)
+
+    def send(self, content: str = None, *, embed: 'dt_embed.Embed' = None) -> bool:
+        """
+        Queues some content or an embed to be sent.
+
+        Content longer than 2000 characters is split across several messages.
+
+        :param content: The content to queue.
+        :param embed: The :class:`.Embed` to queue.
+        :return: True if this was queued, False if it was dropped because the queue was full.
+        """
+        if content is not None:
+            content = str(content) or None
+
+        if content is None and embed is None:
+            raise ValueError("Must provide content or an embed")
+
+        items = []
+        if content is not None:
+            for i in range(0, len(content), self.MAX_CONTENT):
+                items.append((content[i:i + self.MAX_CONTENT], None))
+
+        if embed is not None:
+            items.append((None, embed.to_dict()))
+
+        # every split piece counts against the limit
+        if len(self._queue) + len(items) > self.max_queued:
+            self.dropped += 1
+            return False
+
+        self._queue.extend(items)
+        return True
+
+    def _next_batch(self) -> 'typing.Tuple[str, typing.List[dict]]':
+        """
+        Pops the next batch of content and embeds off the queue.
+        """
+        lines = []
+        length = -1
+        embeds = []
+
+        while self._queue:
+            content, embed = self._queue[0]
+            if content is not None:
+                # +1 for the newline joining it
+                if length + len(content) + 1 > self.MAX_CONTENT:
+                    break
+
+                length += len(content) + 1
+                lines.append(content)
+            else:
+                if len(embeds) >= self.MAX_EMBEDS:
+                    break
+
+                embeds.append(embed)
+
+            self._queue.popleft()
+
+        return "\n".join(lines), embeds
+
+    def _requeue(self, content: str, embeds: 'typing.List[dict]'):
+        """
+        Puts a batch that failed to send back on the front of the queue.
+        """
+        for embed in reversed(embeds):
+            self._queue.appendleft((None, embed))
+
+        if content:
+            self._queue.appendleft((content, None))
+
+    async def flush(self) -> None:
+        """
+        Sends everything that is currently queued.
+
+        If a batch fails to send, it is put back on the front of the queue and the error is
+        raised; after :attr:`MAX_RETRIES` failures in a row, it is dropped instead.
+        """
+        async with self._lock:
+            if self.webhook.token is None:
+                await self.webhook.get_token()
+
+            bot = current_bot.get()
+            while self._queue:
+                content, embeds = self._next_batch()
+                try:
+                    await bot.http.execute_webhook(self.webhook.id, self.webhook.token,
+                                                   content=content, embeds=embeds,
+                                                   username=self.username,
+                                                   avatar_url=self.avatar_url)
+                except Exception:
+                    self._failures += 1
+                    if self._failures <= self.MAX_RETRIES:
+                        self._requeue(content, embeds)
+                        raise
+
+                    logger.exception("Dropping a batch for webhook %s after %d failed attempts",
+                                     self.webhook.id, self._failures)
+                    self._failures = 0
+                    self.dropped += 1
+                else:
+                    self._failures = 0
+                    self.sent += 1
+
+    async def run(self) -> None:
+        """
+        Flushes the queue every ``flush_interval`` seconds, until :meth:`stop` is called.
+
+        Once stopped, the queue is flushed one last time. Anything that still can't be sent is
+        dropped, and counted in :attr:`dropped`.
+        """
+        self._running = True
+        try:
+            while self._running:
+                await multio.asynclib.sleep(self.flush_interval)
+                try:
+                    await self.flush()
+                except Exception:
+                    # back off before the batch is retried on the next pass
+                    backoff = min(self.flush_interval * 2 ** self._failures, self.MAX_BACKOFF)
+                    logger.exception("Failed to send a batch for webhook %s, retrying in %.1fs",
+                                     self.webhook.id, backoff)
+                    await multio.asynclib.sleep(backoff)
+
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("Failed to send the last batches for webhook %s",
+                                 self.webhook.id)
+
+            if self._queue:
+                logger.warning("Dropping %d unsent items for webhook %s", len(self._queue),
+                               self.webhook.id)
+                self.dropped += len(self._queue)
+                self._queue.clear()
+        finally:
+            self._running = False
+
+    def stop(self) -> None:
+        """
+        Stops :meth:`run` after its next flush. Anything still queued is then flushed once more,
+        and dropped if it can't be sent.
+        """
+        self._running = False
@@ -19,6 +19,7 @@ Misc utilities shared throughout the library.
 .. currentmodule:: curious.util
 """
 import base64
+import calendar
 import collections
 import datetime
 import functools
@@ -34,6 +35,9 @@ from multidict import MultiDict
 
 NO_ITEM = object()
 
+#: The Discord epoch, in milliseconds since the Unix epoch, that snowflake timestamps start from.
+DISCORD_EPOCH = 1420070400000
+
 
 def remove_from_multidict(d: MultiDict, key: str, item: Any):
     """
@@ -129,6 +133,31 @@ def base64ify(image_data: bytes):
     return "data:{};base64,{}".format(mimetype, b64_data)
 
 
+def _parse_timestamp(timestamp: str) -> datetime.datetime:
+    """
+    Parses a fixed-width ``YYYY-MM-DDTHH:MM:SS[.fraction]`` timestamp, with any number of
+    fractional digits.
+    """
+    if len(timestamp) < 19 or timestamp[4] != "-" or timestamp[7] != "-" \
+            or timestamp[10] not in "T " or timestamp[13] != ":" or timestamp[16] != ":":
+        raise ValueError("Invalid timestamp: {}".format(timestamp))
+
+    microsecond = 0
+    if len(timestamp) > 19:
+        if timestamp[19] != "." or not timestamp[20:].isdigit():
+            raise ValueError("Invalid timestamp: {}".format(timestamp))
+
+        microsecond = int(timestamp[20:26].ljust(6, "0"))
+
+    return datetime.datetime(int(timestamp[0:4]), int(timestamp[5:7]), int(timestamp[8:10]),
+                             int(timestamp[11:13]), int(timestamp[14:16]), int(timestamp[17:19]),
+                             microsecond)
+
+
+# only on 3.7+; older versions go straight to our own parser
+_fromisoformat = getattr(datetime.datetime, "fromisoformat", _parse_timestamp)
+
+
 def to_datetime(timestamp: str) -> datetime.datetime:
     """
     Converts a Discord-formatted timestamp to a datetime object.
@@ -142,6 +171,22 @@ def to_datetime(timestamp: str) -> datetime.datetime:
     if timestamp.endswith("+00:00"):
         timestamp = timestamp[:-6]
 
+    # opt: strptime is very slow, so try the C ISO-8601 parser and then our own fixed-width
+    # parser (for fractions that aren't 3 or 6 digits) before falling back to it
+    try:
+        dt = _fromisoformat(timestamp)
+    except ValueError:
+        try:
+            return _parse_timestamp(timestamp)
+        except ValueError:
+            pass
+    else:
+        if dt.tzinfo is not None:
+            # other offsets, convert to a naive UTC datetime like the rest
+            dt = dt.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+
+        return dt
+
     try:
         return datetime.datetime.strptime(timestamp, "%Y-%m-%dT%H:%M:%S.%f")
     except ValueError:
@@ -149,6 +194,19 @@ def to_datetime(timestamp: str) -> datetime.datetime:
         return datetime.datetime.strptime(timestamp, "%Y-%m-%dT%H:%M:%S")
 
 
+def to_snowflake(dt: datetime.datetime) -> int:
+    """
+    Converts a datetime object into the lowest snowflake ID that could be created at that time.
+
+    Naive datetimes are assumed to be in UTC, like the ones returned by :func:`.to_datetime`.
+
+    :param dt: The :class:`datetime.datetime` to convert.
+    :return: The snowflake ID that corresponds to this datetime.
+    """
+    timestamp = calendar.timegm(dt.utctimetuple()) * 1000 + dt.microsecond // 1000
+    return max(timestamp - DISCORD_EPOCH, 0) << 22
+
+
 def replace_quotes(item: str) -> str:
     """
     Replaces the quotes in a string, but only if they are un-escaped.
@@ -233,6 +291,42 @@ async def coerce_agen(gen):
     return results
 
 
+class _PrefetchTask(object):
+    """
+    Runs a prefetch in the background, inside its own task group, so that whatever started it
+    can cancel it once the results are no longer wanted.
+    """
+
+    __slots__ = "_group", "_cancelled"
+
+    def __init__(self):
+        self._group = None
+        self._cancelled = False
+
+    async def run(self, cofunc, *args) -> None:
+        """
+        Runs the prefetch. This should be spawned into a task group.
+        """
+        # cancelled before we even got scheduled
+        if self._cancelled:
+            return
+
+        async with multio.asynclib.task_manager() as tg:
+            self._group = tg
+            await multio.asynclib.spawn(tg, cofunc, *args)
+
+        self._group = None
+
+    async def cancel(self) -> None:
+        """
+        Cancels the prefetch, if it is still running.
+        """
+        self._cancelled = True
+        if self._group is not None:
+            await multio.asynclib.cancel_task_group(self._group)
+            self._group = None
+
+
 def subclass_builtin(original: type):
     """
     Subclasses an immutable builtin, providing method wrappers that return the subclass instead